@@ -18,20 +18,33 @@ Updated for pysui 0.92+ API:
 SECURITY WARNING: This bot handles private keys. Ensure proper security measures.
 """
 
+import argparse
 import asyncio
+import atexit
+import contextvars
+import copy
+import queue
+import sys
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+import hashlib
+import heapq
+import json
+import multiprocessing
 import time
 import random
 import os
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Tuple
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Dict, List, Tuple
 from pathlib import Path
 
-from pysui import PysuiConfiguration, SyncGqlClient
-from pysui.sui.sui_types.scalars import ObjectID, SuiString
-from pysui.sui.sui_types.address import SuiAddress
-from pysui.sui.sui_pgql.pgql_sync_txn import SuiTransaction
-from pysui.sui.sui_crypto import keypair_from_keystring
-import requests
+# pysui and requests are imported lazily where they are used so that
+# startup, argument parsing and quick subcommands don't pay for them.
+if TYPE_CHECKING:
+    from pysui import SyncGqlClient
 
 
 # ============================================
@@ -44,9 +57,27 @@ class Config:
     RPC_URL = 'https://sui-testnet-rpc.publicnode.com'
     NETWORK = 'testnet'
     
+    # GraphQL endpoint pool (comma-separated in SUI_GRAPHQL_ENDPOINTS);
+    # when empty, only the pysui profile URL is used
+    GRAPHQL_ENDPOINTS = [url.strip() for url in os.environ.get('SUI_GRAPHQL_ENDPOINTS', '').split(',')
+                         if url.strip()]
+    POOL_EWMA_ALPHA = 0.3
+    POOL_HEALTH_CHECK_INTERVAL = 60
+    POOL_FAILURE_COOLDOWN = 30
+    
     # File Paths
     PRIVATE_KEYS_FILE = 'privatekey.txt'
     PROXY_FILE = 'proxy.txt'
+    RESULTS_DIR = 'results'
+    SCHEDULE_FILE = 'schedule.json'
+    
+    # Scheduler Configuration
+    SCHEDULE_PERIOD = 24 * 60 * 60
+    SCHEDULE_CATCHUP_GRACE = 60 * 60
+    SCHEDULE_SAVE_INTERVAL = 300
+    
+    # Sharding Configuration
+    SHARD_POLL_INTERVAL = 30
     
     # Faucet Configuration
     SUI_FAUCET_URL = 'https://faucet.testnet.sui.io/v2/gas'
@@ -76,6 +107,16 @@ class Config:
     COIN_FETCH_RETRIES = 5
     RATE_LIMIT_COOLDOWN = 30
     
+    # Read Cache (balances and coins, invalidated by the wallet's transactions)
+    READ_CACHE_TTL = 5
+    READ_CACHE_SIZE = 4096
+    
+    # Transaction Submission
+    TX_LEDGER_FILE = 'tx_ledger.jsonl'
+    TX_SUBMIT_RETRIES = 3
+    TX_CONFIRM_DELAY = 3
+    TX_PENDING_MAX_AGE = 2 * 24 * 60 * 60
+    
     # Contract Addresses
     FAUCET_PACKAGE = '0xa03cb0b29e92c6fa9bfb7b9c57ffdba5e23810f20885b4390f724553d32efb8b'
     XAUM_SHARED_OBJECT = '0x66984752afbd878aaee450c70142747bb31fca2bb63f0a083d75c361da39adb1'
@@ -96,6 +137,15 @@ class Config:
     ORACLE_PACKAGE = '0xca9b2f66c5ab734939e048d0732e2a09f486402bb009d88f95c27abe8a4872ee'
     RULE_PACKAGE = '0xbd6d8bb7f40ca9921d0c61404cba6dcfa132f184cf8c0f273008a103889eb0e8'
     
+    # Objects and packages that must exist on chain (checked by preflight)
+    PREFLIGHT_OBJECTS = (
+        'FAUCET_PACKAGE', 'XAUM_SHARED_OBJECT', 'USDC_SHARED_OBJECT',
+        'GUSD_PACKAGE', 'GUSD_VAULT', 'GUSD_MARKET',
+        'STAKING_MANAGER', 'CLOCK_OBJECT',
+        'LENDING_PACKAGE', 'PROTOCOL_OBJECT', 'LENDING_MARKET',
+        'XORACLE_OBJECT', 'PRICE_ORACLE', 'ORACLE_PACKAGE', 'RULE_PACKAGE',
+    )
+    
     # Token Types
     USDC_TYPE = '0xa03cb0b29e92c6fa9bfb7b9c57ffdba5e23810f20885b4390f724553d32efb8b::usdc::USDC'
     GUSD_TYPE = '0x5434351f2dcae30c0c4b97420475c5edc966b02fd7d0bbe19ea2220d2f623586::coin_gusd::COIN_GUSD'
@@ -120,6 +170,16 @@ class HealthFactorConfig:
         'USDC': 5 * 1e9
     }
     
+    # Health factor status thresholds
+    CRITICAL = 1.5
+    WARNING = 2.0
+    SAFE = 10
+    
+    # Background monitor: event polling interval (seconds) and the Move
+    # packages whose events mark a tracked wallet for recomputation
+    MONITOR_INTERVAL = 60
+    MONITOR_PACKAGES = (Config.LENDING_PACKAGE, Config.GUSD_PACKAGE)
+    
     # WARNING: These are hardcoded prices - should be fetched from oracles
     PRICE = {
         'GR': 150.5,
@@ -129,10 +189,553 @@ class HealthFactorConfig:
     }
 
 
+# Coins tracked per wallet, in the fixed order used by BalanceSnapshot
+COIN_NAMES = ('GR', 'SUI', 'USDC', 'GUSD', 'XAUM')
+COIN_TYPES = (Config.GR_TYPE, Config.SUI_TYPE, Config.USDC_TYPE, Config.GUSD_TYPE, Config.XAUM_TYPE)
+COIN_DECIMALS = (Config.DECIMALS, Config.MIST_PER_SUI, Config.DECIMALS, Config.DECIMALS, Config.DECIMALS)
+COIN_INDEX = {name: index for index, name in enumerate(COIN_NAMES)}
+
+
+# ============================================
+# WALLET STATE
+# ============================================
+
+def format_units(raw: int, decimals: int, places: int = 6) -> str:
+    """Format an integer amount in base units as an exact decimal string"""
+    sign = '-' if raw < 0 else ''
+    whole, fraction = divmod(abs(raw), decimals)
+    if places == 0:
+        return f"{sign}{whole}"
+    return f"{sign}{whole}.{fraction * 10 ** places // decimals:0{places}d}"
+
+
+class BalanceSnapshot:
+    """Raw u64 balances of the tracked coins, indexed like COIN_NAMES
+    
+    Balances stay in integer base units; conversion to decimals happens
+    only when formatting for reports.
+    """
+    
+    __slots__ = ('raw',)
+    
+    def __init__(self, raw=None):
+        self.raw = array('Q', raw if raw is not None else [0] * len(COIN_NAMES))
+    
+    @classmethod
+    def capture(cls, wallet_manager: 'WalletManager', address: str) -> 'BalanceSnapshot':
+        """Read the current balances of every tracked coin"""
+        return cls(wallet_manager.get_raw_balance(address, coin_type) for coin_type in COIN_TYPES)
+    
+    def __getitem__(self, name: str) -> int:
+        return self.raw[COIN_INDEX[name]]
+    
+    def amount(self, name: str) -> float:
+        """Balance of a coin in token units (for display)"""
+        index = COIN_INDEX[name]
+        return self.raw[index] / COIN_DECIMALS[index]
+    
+    def to_dict(self) -> Dict[str, int]:
+        return dict(zip(COIN_NAMES, self.raw))
+
+
+class WalletState:
+    """Outcome of processing one wallet"""
+    
+    __slots__ = ('wallet_index', 'address', 'success', 'xaum_claims', 'usdc_claims',
+                 'balance_before', 'balance_after')
+    
+    def __init__(self, wallet_index: int, address: str):
+        self.wallet_index = wallet_index
+        self.address = address
+        self.success = False
+        self.xaum_claims = 0
+        self.usdc_claims = 0
+        self.balance_before: Optional[BalanceSnapshot] = None
+        self.balance_after: Optional[BalanceSnapshot] = None
+    
+    def add_to(self, total_stats: Dict):
+        """Add this wallet's outcome to the day's total_stats"""
+        total_stats['success' if self.success else 'failed'] += 1
+        total_stats['xaumClaims'] += self.xaum_claims
+        total_stats['usdcClaims'] += self.usdc_claims
+
+
+# ============================================
+# EVENT LOG
+# ============================================
+
+# Fields (wallet index, step, ...) attached to every event of the current task
+_log_fields: contextvars.ContextVar = contextvars.ContextVar('log_fields', default={})
+
+
+class ConsoleRenderer:
+    """Renders events as the human readable console view"""
+    
+    def __init__(self, quiet: bool = False):
+        self.quiet = quiet
+    
+    def render(self, record: Dict) -> Optional[str]:
+        """Text for an event, or None if it has no console output"""
+        message = record.get('msg')
+        if message is None or (self.quiet and record.get('banner')):
+            return None
+        return message
+
+
+class EventLog:
+    """Structured event log with a buffered background writer
+    
+    Every event is a dict with a timestamp, an event name and the current
+    log fields (wallet index, step). A background thread writes events in
+    batches as JSON lines to an optional file and renders them to stdout,
+    so callers never block on I/O and multi-line banners stay together.
+    """
+    
+    def __init__(self, path: Optional[str] = None, console: bool = True, quiet: bool = False,
+                 batch_size: int = 1000):
+        self.path = path
+        self.renderer = ConsoleRenderer(quiet) if console else None
+        self.batch_size = batch_size
+        self._file = open(path, 'a', buffering=1 << 16, encoding='utf-8') if path else None
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='event-log', daemon=True)
+        self._thread.start()
+    
+    def emit(self, record: Dict):
+        if not self._closed:
+            self._queue.put(record)
+    
+    def _run(self):
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            lines = []
+            for record in batch:
+                if record is None:
+                    stop = True
+                    continue
+                if self._file:
+                    self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+                text = self.renderer.render(record) if self.renderer else None
+                if text is not None:
+                    lines.append(text)
+            
+            if lines:
+                sys.stdout.write('\n'.join(lines) + '\n')
+                sys.stdout.flush()
+            if self._file:
+                self._file.flush()
+    
+    def close(self):
+        """Flush pending events and stop the writer"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        if self._file:
+            self._file.close()
+
+
+_event_log: Optional[EventLog] = None
+
+
+def get_event_log() -> EventLog:
+    """Get the active event log, creating a console-only one on first use"""
+    global _event_log
+    if _event_log is None:
+        _event_log = EventLog()
+        atexit.register(_event_log.close)
+    return _event_log
+
+
+def set_event_log(event_log: Optional[EventLog]) -> Optional[EventLog]:
+    """Replace the active event log, returning the previous one (not closed)"""
+    global _event_log
+    previous, _event_log = _event_log, event_log
+    if event_log:
+        atexit.register(event_log.close)
+    return previous
+
+
+def log_event(event: str, message: Optional[str] = None, banner: bool = False, **fields):
+    """Emit a structured event; message is its console text (None for log-only events)"""
+    record = {'ts': round(get_clock().time(), 3), 'event': event}
+    record.update(_log_fields.get())
+    record.update(fields)
+    if message is not None:
+        record['msg'] = message
+    if banner:
+        record['banner'] = True
+    get_event_log().emit(record)
+
+
+def log(message: str = '', event: str = 'message', **fields):
+    """Emit a console message as an event"""
+    log_event(event, message, **fields)
+
+
+def log_banner(lines: List[str], event: str = 'banner', **fields):
+    """Emit a multi-line banner as a single event (dropped in quiet mode)"""
+    log_event(event, '\n'.join(lines), banner=True, **fields)
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach fields to every event logged inside the block"""
+    token = _log_fields.set({**_log_fields.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_fields.reset(token)
+
+
+@contextmanager
+def log_step(step: str):
+    """Run a wallet step: tags its events, logs its latency and traces it as a span"""
+    started = get_clock().monotonic()
+    with log_context(step=step), trace_span(step, 'step'):
+        log_event('step_start')
+        try:
+            yield
+        finally:
+            log_event('step_end', latency_ms=round((get_clock().monotonic() - started) * 1000, 1))
+
+
+# ============================================
+# TRACING
+# ============================================
+
+# Span currently open in this task (parent of any span started inside it)
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    """An open trace span"""
+    
+    __slots__ = ('span_id', 'name', 'cat', 'parent', 'step', 'in_wallet', 'wallet', 'start', 'args',
+                 'children')
+    
+    def __init__(self, span_id: int, name: str, cat: str, parent: Optional['Span'], args: Dict):
+        self.span_id = span_id
+        self.name = name
+        self.cat = cat
+        self.parent = parent
+        # Wallet step this span belongs to, for the per-step sleep/I/O split
+        self.step = name if cat == 'step' else (parent.step if parent else None)
+        self.in_wallet = cat == 'wallet' or bool(parent and parent.in_wallet)
+        self.wallet = _log_fields.get().get('wallet', 0)
+        self.start = get_clock().monotonic()
+        self.args = args
+        # (start, end, critical path) of each finished child
+        self.children: List[Tuple[float, float, Tuple]] = []
+
+
+class Tracer:
+    """Records spans to a Chrome trace file and aggregates a per-step summary
+    
+    Spans are streamed to the file as they finish (JSON array format, open
+    with chrome://tracing or Perfetto), one row per wallet. Only aggregates
+    are kept in memory: per step its count, durations, sleep and I/O time,
+    and the critical path of its slowest run.
+    
+    A critical path is a (name, seconds, children) tree: children that ran
+    one after another are all on it, of children that overlapped in time
+    only the longest is.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.origin = get_clock().monotonic()
+        self.pid = os.getpid()
+        # Sleep and I/O inside wallets; background is I/O outside them (health monitor),
+        # idle is sleep outside them (the scheduler waiting for the next wallet)
+        self.totals = {'wallet': 0.0, 'sleep': 0.0, 'io': 0.0, 'background': 0.0, 'idle': 0.0}
+        self.steps: Dict[str, Dict] = {}
+        self._next_id = 0
+        self._file = open(path, 'w', buffering=1 << 16, encoding='utf-8') if path else None
+        self._written = 0
+        self._closed = False
+        # Spans also end in worker threads (health monitor reads)
+        self._lock = threading.Lock()
+        if self._file:
+            self._file.write('[\n')
+    
+    def begin(self, name: str, cat: str, args: Dict) -> Span:
+        with self._lock:
+            self._next_id += 1
+            span = Span(self._next_id, name, cat, _current_span.get(), args)
+            if cat == 'step':
+                self.steps.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0,
+                                             'sleep': 0.0, 'io': 0.0, 'path': None})
+        return span
+    
+    def end(self, span: Span):
+        with self._lock:
+            self._end(span)
+    
+    def _end(self, span: Span):
+        end = get_clock().monotonic()
+        duration = end - span.start
+        path = (span.name, duration, self._critical_children(span.children))
+        parent = span.parent
+        if parent:
+            parent.children.append((span.start, end, path))
+        
+        if span.cat == 'io' and not span.in_wallet:
+            self.totals['background'] += duration
+        elif span.cat == 'sleep' and not span.in_wallet:
+            self.totals['idle'] += duration
+        elif span.cat in self.totals:
+            self.totals[span.cat] += duration
+        stats = self.steps.get(span.step)
+        if stats is not None:
+            if span.cat in ('sleep', 'io'):
+                stats[span.cat] += duration
+            elif span.cat == 'step':
+                stats['count'] += 1
+                stats['total'] += duration
+                if duration >= stats['max']:
+                    stats['max'] = duration
+                    stats['path'] = path
+        
+        if self._file and not self._closed:
+            event = {
+                'name': span.name, 'cat': span.cat, 'ph': 'X',
+                'ts': round((span.start - self.origin) * 1e6),
+                'dur': round(duration * 1e6),
+                'pid': self.pid, 'tid': span.wallet,
+                'args': dict(span.args, id=span.span_id,
+                             parent=parent.span_id if parent else None)
+            }
+            self._file.write((',\n' if self._written else '') + json.dumps(event, default=str))
+            self._written += 1
+    
+    @staticmethod
+    def _critical_children(children: List[Tuple[float, float, Tuple]]) -> List[Tuple]:
+        """Paths of the children on the critical path, in order"""
+        paths = []
+        group_end = None
+        for start, end, path in sorted(children, key=lambda child: child[0]):
+            if paths and start < group_end:
+                # Overlaps the previous child: only the longer one is critical
+                if path[1] > paths[-1][1]:
+                    paths[-1] = path
+                group_end = max(group_end, end)
+            else:
+                paths.append(path)
+                group_end = end
+        return paths
+    
+    @classmethod
+    def _format_path(cls, path: Tuple) -> str:
+        name, seconds, children = path
+        text = f"{name} {seconds:.2f}s"
+        if children:
+            text += ' (' + ' → '.join(cls._format_path(child) for child in children) + ')'
+        return text
+    
+    def summary(self) -> List[str]:
+        """Console lines of the per-step critical path and sleep vs I/O split"""
+        wallet_time = self.totals['wallet']
+        other = max(wallet_time - self.totals['sleep'] - self.totals['io'], 0.0)
+        lines = [
+            f"\n{'═' * 70}",
+            f"  🧭 TRACE SUMMARY" + (f" ({self.path})" if self.path else ''),
+            f"{'═' * 70}",
+            f"  ⏳ Sleeping: {self.totals['sleep']:.1f}s | 🌐 I/O: {self.totals['io']:.1f}s | "
+            f"⚙️ Other: {other:.1f}s (wallets: {wallet_time:.1f}s)",
+            f"  🌐 Background I/O: {self.totals['background']:.1f}s | "
+            f"💤 Idle between wallets: {self.totals['idle']:.1f}s"
+        ]
+        for name, stats in self.steps.items():
+            if not stats['count']:
+                continue
+            lines.append(f"  📍 {name}: {stats['count']}× avg {stats['total'] / stats['count']:.2f}s | "
+                         f"max {stats['max']:.2f}s | sleep {stats['sleep']:.1f}s | I/O {stats['io']:.1f}s")
+            lines.append('     critical path of slowest run: ' + self._format_path(stats['path']))
+        lines.append(f"{'═' * 70}\n")
+        return lines
+    
+    def close(self):
+        """Finish the trace file and log the summary"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._file:
+                self._file.write('\n]\n')
+                self._file.close()
+        log_event('trace_summary', '\n'.join(self.summary()), totals=self.totals, steps=self.steps)
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Get the active tracer (None when tracing is off)"""
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> Optional[Tracer]:
+    """Replace the active tracer, returning the previous one (not closed)"""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    if tracer:
+        atexit.register(tracer.close)
+    return previous
+
+
+@contextmanager
+def trace_span(name: str, cat: str, **args):
+    """Trace the block as a span, child of the enclosing span (no-op without a tracer)
+    
+    Categories with special meaning: 'wallet', 'step', 'sleep' and 'io'.
+    """
+    tracer = _tracer
+    if tracer is None:
+        yield
+        return
+    span = tracer.begin(name, cat, args)
+    token = _current_span.set(span)
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+        tracer.end(span)
+
+
 # ============================================
 # UTILITY FUNCTIONS
 # ============================================
 
+class Clock(ABC):
+    """Source of timestamps and waits
+    
+    All timing in the bot goes through the active clock (see get_clock), so
+    a VirtualClock can replace wall-clock time in simulations and tests.
+    """
+    
+    @abstractmethod
+    def time(self) -> float:
+        """Current Unix timestamp"""
+    
+    @abstractmethod
+    def monotonic(self) -> float:
+        """Monotonic timestamp for measuring durations"""
+    
+    def now(self) -> datetime:
+        """Current local datetime"""
+        return datetime.fromtimestamp(self.time())
+    
+    @abstractmethod
+    async def sleep(self, seconds: float):
+        """Wait without blocking the event loop"""
+    
+    @abstractmethod
+    def sleep_sync(self, seconds: float):
+        """Wait, blocking the calling thread"""
+
+
+class SystemClock(Clock):
+    """Wall-clock time"""
+    
+    def time(self) -> float:
+        return time.time()
+    
+    def monotonic(self) -> float:
+        return time.monotonic()
+    
+    def now(self) -> datetime:
+        return datetime.now()
+    
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+    
+    def sleep_sync(self, seconds: float):
+        time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """Simulated time that jumps forward instead of waiting
+    
+    Sleeping tasks wait on futures kept in a deadline heap. Once the event
+    loop has nothing else ready to run (every task is waiting), the clock
+    jumps to the earliest deadline and wakes its sleepers, so concurrent
+    sleepers share virtual time like they share wall-clock time. sleep_sync
+    cannot wait for other tasks and advances the clock immediately.
+    """
+    
+    def __init__(self, start: Optional[float] = None):
+        self._now = time.time() if start is None else start
+        self.slept = 0.0
+        self._sleepers: List[Tuple[float, int, asyncio.Future]] = []
+        self._sequence = 0
+        self._armed: Optional[asyncio.AbstractEventLoop] = None
+    
+    def time(self) -> float:
+        return self._now
+    
+    def monotonic(self) -> float:
+        return self._now
+    
+    def advance(self, seconds: float):
+        if seconds > 0:
+            self._now += seconds
+            self.slept += seconds
+    
+    async def sleep(self, seconds: float):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._sequence += 1
+        heapq.heappush(self._sleepers, (self._now + max(seconds, 0), self._sequence, future))
+        if self._armed is not loop:
+            self._armed = loop
+            loop.call_soon(self._advance_when_idle, loop)
+        await future
+    
+    def _advance_when_idle(self, loop: asyncio.AbstractEventLoop):
+        """Jump to the earliest deadline once no other callback is ready to run"""
+        while self._sleepers and self._sleepers[0][2].done():
+            heapq.heappop(self._sleepers)  # cancelled sleeper
+        if not self._sleepers:
+            self._armed = None
+            return
+        # Loops without a visible ready queue are treated as idle after each pass
+        if not getattr(loop, '_ready', None):
+            self.advance(self._sleepers[0][0] - self._now)
+            while self._sleepers and self._sleepers[0][0] <= self._now:
+                _, _, future = heapq.heappop(self._sleepers)
+                if not future.done():
+                    future.set_result(None)
+        loop.call_soon(self._advance_when_idle, loop)
+    
+    def sleep_sync(self, seconds: float):
+        self.advance(seconds)
+
+
+_clock: Clock = SystemClock()
+
+
+def get_clock() -> Clock:
+    """Get the active clock"""
+    return _clock
+
+
+def set_clock(clock: Clock) -> Clock:
+    """Replace the active clock, returning the previous one"""
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
 def get_random_delay(min_sec: int, max_sec: int) -> int:
     """Get random delay in seconds"""
     return random.randint(min_sec, max_sec)
@@ -140,8 +743,17 @@ def get_random_delay(min_sec: int, max_sec: int) -> int:
 
 async def delay(seconds: int, message: str = 'Waiting'):
     """Async delay with logging"""
-    print(f"⏳ {message} {seconds}s...")
-    await asyncio.sleep(seconds)
+    log(f"⏳ {message} {seconds}s...", event='sleep', seconds=seconds)
+    with trace_span('sleep', 'sleep', reason=message.rstrip(':')):
+        await get_clock().sleep(seconds)
+
+
+def normalize_object_id(object_id: str) -> str:
+    """Normalize a Sui object ID to lowercase, 0x-prefixed, 64 hex digits"""
+    hex_id = object_id.lower()
+    if hex_id.startswith('0x'):
+        hex_id = hex_id[2:]
+    return '0x' + hex_id.rjust(64, '0')
 
 
 def get_random_amount(min_val: float, max_val: float, decimals: int = Config.DECIMALS) -> int:
@@ -149,6 +761,11 @@ def get_random_amount(min_val: float, max_val: float, decimals: int = Config.DEC
     return int((random.uniform(min_val, max_val)) * decimals)
 
 
+def parse_private_keys(lines) -> List[str]:
+    """Extract private keys from key file lines, skipping blanks and comments"""
+    return [line.strip() for line in lines if line.strip() and not line.startswith('#')]
+
+
 def read_private_keys(filename: str = Config.PRIVATE_KEYS_FILE) -> List[str]:
     """Read private keys from file
     
@@ -156,23 +773,128 @@ def read_private_keys(filename: str = Config.PRIVATE_KEYS_FILE) -> List[str]:
     """
     filepath = Path(filename)
     if not filepath.exists():
-        print(f"❌ File {filename} not found!")
+        log(f"❌ File {filename} not found!", event='error', path=filename)
         return []
     
     try:
         with open(filepath, 'r') as f:
-            keys = [line.strip() for line in f if line.strip() and not line.startswith('#')]
-        return keys
+            return parse_private_keys(f)
     except Exception as e:
-        print(f"Error reading {filename}: {str(e)}")
+        log(f"Error reading {filename}: {str(e)}", event='error', path=filename, error=str(e))
         return []
 
 
+def parse_shard_spec(spec: str) -> Tuple[int, int]:
+    """Parse a shard spec of the form 'i/N' (1-based) into (index, count)"""
+    try:
+        index_str, count_str = spec.split('/', 1)
+        index, count = int(index_str), int(count_str)
+    except ValueError:
+        raise ValueError(f"Invalid shard spec '{spec}', expected i/N")
+    
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard spec '{spec}', need 1 <= i <= N")
+    return index, count
+
+
+def shard_private_keys(private_keys: List[str],
+                       shard: Optional[Tuple[int, int]] = None) -> List[Tuple[int, str]]:
+    """Select the deterministic slice of keys owned by a shard
+    
+    Keys are striped across shards by position in the key file, so every
+    shard gets an even share and the slices never overlap. Wallet indices
+    are kept global (1-based) so proxy mappings still line up.
+    
+    Returns:
+        List of (wallet_index, private_key) tuples
+    """
+    wallets = list(enumerate(private_keys, 1))
+    if not shard:
+        return wallets
+    
+    index, count = shard
+    return [(wallet_index, key) for wallet_index, key in wallets
+            if (wallet_index - 1) % count == index - 1]
+
+
+def shard_result_path(results_dir: str, run_id: str, day: int, shard: Tuple[int, int]) -> Path:
+    """Path of the results file a shard writes at the end of a day"""
+    index, count = shard
+    return Path(results_dir) / f"{run_id}-day{day:04d}-shard{index}of{count}.json"
+
+
+def shard_output_path(path: Optional[str], shard: Tuple[int, int]) -> Optional[str]:
+    """Per-shard output file name, e.g. events.jsonl -> events-shard1of4.jsonl"""
+    if not path:
+        return None
+    path = Path(path)
+    return str(path.with_name(f"{path.stem}-shard{shard[0]}of{shard[1]}{path.suffix}"))
+
+
+def result_days(results_dir: str, run_id: str, shard_count: int) -> List[int]:
+    """Day numbers that have at least one shard results file, in order
+    
+    Days are counted from the schedule's anchor, so after a restart a run
+    may start at any day number.
+    """
+    prefix = f"{run_id}-day"
+    days = set()
+    for path in Path(results_dir).glob(f"{run_id}-day*-shard*of{shard_count}.json"):
+        day = path.name[len(prefix):].split('-', 1)[0]
+        if day.isdigit():
+            days.add(int(day))
+    return sorted(days)
+
+
+def write_json_atomic(path: Path, data: Dict, indent: Optional[int] = 2):
+    """Write a JSON file atomically (write to temp file, then rename)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        f.write(json.dumps(data, indent=indent))
+    os.replace(tmp_path, path)
+
+
+def write_shard_result(path: Path, result: Dict):
+    """Atomically write a shard's daily results file"""
+    write_json_atomic(path, result)
+
+
+def merge_shard_results(results: List[Dict]) -> Dict:
+    """Merge per-shard daily results into a single report
+    
+    Shards without wallets that day have null start/end times and only add
+    to the counts; start/end stay null if no shard processed a wallet.
+    """
+    merged = {
+        'wallets': 0,
+        'start': None,
+        'end': None,
+        'stats': {
+            'success': 0,
+            'failed': 0,
+            'xaumClaims': 0,
+            'usdcClaims': 0
+        }
+    }
+    
+    for result in results:
+        merged['wallets'] += result['wallets']
+        if result['start'] and (merged['start'] is None or result['start'] < merged['start']):
+            merged['start'] = result['start']
+        if result['end'] and (merged['end'] is None or result['end'] > merged['end']):
+            merged['end'] = result['end']
+        for key, value in result['stats'].items():
+            merged['stats'][key] = merged['stats'].get(key, 0) + value
+    
+    return merged
+
+
 def read_proxy_mappings(filename: str = Config.PROXY_FILE) -> Dict[str, Optional[str]]:
     """Read proxy mappings from file"""
     filepath = Path(filename)
     if not filepath.exists():
-        print(f"⚠️ File {filename} not found - using local IP for all wallets\n")
+        log(f"⚠️ File {filename} not found - using local IP for all wallets\n", event='warning', path=filename)
         return {}
     
     try:
@@ -187,7 +909,7 @@ def read_proxy_mappings(filename: str = Config.PROXY_FILE) -> Dict[str, Optional
                     proxies[f'pk{index}'] = None
         return proxies
     except Exception as e:
-        print(f"Error reading {filename}: {str(e)}")
+        log(f"Error reading {filename}: {str(e)}", event='error', path=filename, error=str(e))
         return {}
 
 
@@ -197,18 +919,319 @@ def get_proxy_for_wallet(wallet_index: int, proxy_mappings: Dict) -> Optional[st
     proxy = proxy_mappings.get(key)
     
     if not proxy:
-        print(f"  🌍 Local IP")
+        log(f"  🌍 Local IP", event='proxy', proxy=None)
         return None
     
-    print(f"  🔗 Proxy: {proxy}")
+    log(f"  🔗 Proxy: {proxy}", event='proxy', proxy=proxy)
     return proxy
 
 
+# Text of pysui/gql errors caused by the transport rather than the request:
+# HTTP 429/5xx (gql's TransportServerError) and non-GraphQL responses
+TRANSPORT_ERROR_MARKERS = ("'429 ", "Server error '", 'did not return a GraphQL result')
+
+# Transaction validation errors: the node refused the transaction before it
+# reached consensus, so it can never execute. Any other GraphQL error on
+# submission (e.g. REQUEST_TIMEOUT, internal errors) leaves the outcome unknown.
+TX_REJECTION_MARKERS = (
+    'issues with transaction inputs', 'Invalid user signature', 'Signature is not valid',
+    'is lower than the needed amount', 'InsufficientGas', 'GasBalanceTooLow',
+    'not available for consumption', 'ObjectVersionUnavailableForConsumption',
+    'Could not find the referenced object', 'ObjectNotFound'
+)
+
+
+def is_transport_error(error: Exception) -> bool:
+    """Whether an exception means the endpoint could not be reached (timeout, connection, HTTP)"""
+    return (isinstance(error, (TimeoutError, ConnectionError))
+            or type(error).__module__.split('.')[0] in ('httpx', 'httpcore'))
+
+
+def is_transport_failure(result) -> bool:
+    """Whether a failed SuiRpcResult came from the transport
+    
+    pysui returns transport errors as failed results: httpx errors (including
+    timeouts) as 'HTTPX error: ...', and HTTP error statuses wrapped in a
+    generic error. GraphQL errors (e.g. a rejected transaction) and encoding
+    errors are answers from a healthy node.
+    """
+    if result.is_ok():
+        return False
+    if str(result.result_string).startswith('HTTPX error'):
+        return True
+    return any(marker in error_detail(result) for marker in TRANSPORT_ERROR_MARKERS)
+
+
+def is_tx_rejection(result) -> bool:
+    """Whether a failed submission was definitely rejected (see TX_REJECTION_MARKERS)"""
+    if result.is_ok() or not str(result.result_string).startswith('TransportQueryError'):
+        return False
+    detail = f"{result.result_string} {error_detail(result)}"
+    return any(marker in detail for marker in TX_REJECTION_MARKERS)
+
+
+def error_detail(result) -> str:
+    """Text of the errors attached to a failed SuiRpcResult"""
+    errors = getattr(result.result_data, 'errors', None)
+    return ' '.join(str(error) for error in errors) if isinstance(errors, (list, tuple)) else str(errors)
+
+
+class PoolEndpoint:
+    """A GraphQL endpoint in the client pool with its latency and health"""
+    
+    def __init__(self, url: str, client: 'SyncGqlClient'):
+        self.url = url
+        self.client = client
+        self.latency: Optional[float] = None
+        self.failures = 0
+        self.down_until = 0.0
+        self.last_check = 0.0
+    
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.down_until
+    
+    def record_success(self, latency: float, now: float):
+        """Fold a successful call's latency into the EWMA"""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            alpha = Config.POOL_EWMA_ALPHA
+            self.latency = alpha * latency + (1 - alpha) * self.latency
+        self.failures = 0
+        self.down_until = 0.0
+        self.last_check = now
+    
+    def record_failure(self, now: float):
+        """Take the endpoint out of rotation, backing off on repeated failures"""
+        self.failures += 1
+        self.down_until = now + Config.POOL_FAILURE_COOLDOWN * min(self.failures, 10)
+        self.last_check = now
+
+
+class ClientPool:
+    """Pool of GraphQL clients with latency-aware routing and failover
+    
+    Reads go to the healthy endpoint with the lowest EWMA latency and fail
+    over to the next one on errors. Transactions are pinned to one endpoint
+    per wallet so a wallet's submissions and follow-up reads stay consistent.
+    """
+    
+    def __init__(self, pysui_config, endpoints: Optional[List[str]] = None):
+        urls = list(dict.fromkeys(endpoints or [])) or [pysui_config.url]
+        self._configs = [(url, pysui_config if url == pysui_config.url else self._config_for(url, index))
+                         for index, url in enumerate(urls)]
+        self._connect()
+    
+    def _connect(self):
+        """Create a client per endpoint"""
+        from pysui import SyncGqlClient
+        
+        self.endpoints: List[PoolEndpoint] = [PoolEndpoint(url, SyncGqlClient(pysui_config=config))
+                                              for url, config in self._configs]
+        self._pins: Dict[str, PoolEndpoint] = {}
+        self._last_health_check = get_clock().monotonic()
+    
+    def fork(self) -> 'ClientPool':
+        """A pool for the same endpoints with its own clients
+        
+        gql opens and closes a client's transport on every call, so a client
+        must never be used from two threads at once: work running in a worker
+        thread gets its own fork of the pool.
+        """
+        pool = copy.copy(self)
+        pool._connect()
+        return pool
+    
+    @staticmethod
+    def _config_for(url: str, index: int):
+        """Build a pysui configuration whose active profile points at url"""
+        from pysui import PysuiConfiguration
+        
+        config = PysuiConfiguration(group_name=PysuiConfiguration.SUI_GQL_RPC_GROUP)
+        profile_name = f'creek-pool-{index}'
+        if profile_name in config.profile_names():
+            config.update_profile(profile_name=profile_name, url=url, persist=False)
+        else:
+            config.new_profile(profile_name=profile_name, url=url, persist=False)
+        config.make_active(profile_name=profile_name, persist=False)
+        return config
+    
+    def _ranked(self) -> List[PoolEndpoint]:
+        """Endpoints ordered by health, then EWMA latency (unmeasured first)"""
+        now = get_clock().monotonic()
+        return sorted(self.endpoints, key=lambda endpoint: (
+            not endpoint.is_healthy(now),
+            endpoint.latency if endpoint.latency is not None else 0.0
+        ))
+    
+    def _call(self, endpoint: PoolEndpoint, fn):
+        """Run fn against an endpoint and record the outcome
+        
+        Only transport failures count against the endpoint; application
+        errors (rejected transactions, bad queries) are returned as they are.
+        """
+        started = get_clock().monotonic()
+        try:
+            with trace_span('graphql', 'io', endpoint=endpoint.url):
+                result = fn(endpoint.client)
+        except Exception as e:
+            if is_transport_error(e):
+                endpoint.record_failure(get_clock().monotonic())
+            raise
+        
+        now = get_clock().monotonic()
+        if is_transport_failure(result):
+            endpoint.record_failure(now)
+        else:
+            endpoint.record_success(now - started, now)
+        return result
+    
+    def read(self, fn):
+        """Execute a read, failing over to the next endpoint on transport errors
+        
+        Args:
+            fn: Callable taking a client and returning a SuiRpcResult
+            
+        Returns:
+            The first result that is not a transport failure, or the last
+            failure if every endpoint failed
+        """
+        self.maybe_health_check()
+        
+        result = None
+        last_error = None
+        for endpoint in self._ranked():
+            try:
+                result = self._call(endpoint, fn)
+            except Exception as e:
+                if not is_transport_error(e):
+                    raise
+                last_error = e
+                continue
+            if not is_transport_failure(result):
+                return result
+        
+        if result is None and last_error is not None:
+            raise last_error
+        return result
+    
+    def pinned(self, address: str) -> 'SyncGqlClient':
+        """Client pinned to a wallet; re-pinned only if its endpoint goes down"""
+        endpoint = self._pins.get(address)
+        if endpoint is None or not endpoint.is_healthy(get_clock().monotonic()):
+            endpoint = self._ranked()[0]
+            self._pins[address] = endpoint
+        return endpoint.client
+    
+    def submit(self, address: str, fn):
+        """Execute a transaction call on the wallet's pinned endpoint (no failover)"""
+        self.pinned(address)
+        return self._call(self._pins[address], fn)
+    
+    def maybe_health_check(self):
+        """Run health checks if the check interval has elapsed"""
+        if get_clock().monotonic() - self._last_health_check >= Config.POOL_HEALTH_CHECK_INTERVAL:
+            self.health_check()
+    
+    def health_check(self):
+        """Probe endpoints that are back from a cooldown or were not used recently"""
+        import pysui.sui.sui_pgql.pgql_query as qn
+        
+        now = get_clock().monotonic()
+        self._last_health_check = now
+        for endpoint in self.endpoints:
+            if not endpoint.is_healthy(now):
+                continue
+            stale = now - endpoint.last_check >= Config.POOL_HEALTH_CHECK_INTERVAL
+            if not stale and not endpoint.failures:
+                continue
+            try:
+                self._call(endpoint, lambda client: client.execute_query_node(
+                    with_node=qn.GetLatestCheckpointSequence()
+                ))
+            except Exception:
+                pass
+
+
+class ReadCache:
+    """Short-TTL LRU cache for chain reads, with request coalescing
+    
+    Identical reads issued while one is in flight wait for it instead of
+    querying again (single-flight), and results are reused for `ttl`
+    seconds. Entries are grouped by wallet address so a transaction can
+    invalidate everything read for that wallet; a read that was in flight
+    during the invalidation is returned but not cached.
+    """
+    
+    def __init__(self, ttl: float = Config.READ_CACHE_TTL, maxsize: int = Config.READ_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()   # key -> (expires, value)
+        self._keys: Dict[str, set] = {}              # address -> cached keys
+        self._generations: Dict[str, int] = {}       # address -> invalidation count
+        self._flights: Dict[Tuple, Dict] = {}        # key -> in-flight read
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple, address: str, load):
+        """Cached value for key, calling load() at most once for concurrent misses"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > get_clock().monotonic():
+                self._entries.move_to_end(key)
+                return entry[1]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = {'done': threading.Event(), 'value': None, 'error': None,
+                                               'generation': self._generations.get(address, 0)}
+        
+        if not leader:
+            flight['done'].wait()
+            if flight['error'] is not None:
+                raise flight['error']
+            return flight['value']
+        
+        try:
+            flight['value'] = load()
+        except Exception as e:
+            flight['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight['error'] is None and flight['generation'] == self._generations.get(address, 0):
+                    self._store(key, address, flight['value'])
+            flight['done'].set()
+        return flight['value']
+    
+    def _store(self, key: Tuple, address: str, value):
+        self._entries[key] = (get_clock().monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        self._keys.setdefault(address, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            old_key, _ = self._entries.popitem(last=False)
+            keys = self._keys.get(old_key[1])
+            if keys:
+                keys.discard(old_key)
+    
+    def invalidate(self, address: str):
+        """Drop every cached read of a wallet (e.g. after its transaction)"""
+        with self._lock:
+            self._generations[address] = self._generations.get(address, 0) + 1
+            for key in self._keys.pop(address, ()):
+                self._entries.pop(key, None)
+
+
 class WalletManager:
     """Manages wallet operations"""
     
-    def __init__(self, client: SyncGqlClient):
-        self.client = client
+    def __init__(self, pool: ClientPool):
+        self.pool = pool
+        self.cache = ReadCache()
+    
+    def invalidate(self, address: str):
+        """Forget cached reads of a wallet whose balances changed"""
+        self.cache.invalidate(address)
     
     def import_wallet(self, private_key: str) -> Optional[Tuple[any, str]]:
         """Import wallet from private key string
@@ -219,84 +1242,169 @@ class WalletManager:
         Returns:
             Tuple of (keypair, address) or None if failed
         """
+        from pysui.sui.sui_crypto import keypair_from_keystring
+        
         try:
             # Import keypair from keystring
             keypair = keypair_from_keystring(private_key)
             address = keypair.to_address()
             return (keypair, address)
         except Exception as e:
-            print(f"Error importing wallet: {str(e)}")
+            log(f"Error importing wallet: {str(e)}", event='error', error=str(e))
             return None
     
-    def get_sui_balance(self, address: str) -> float:
-        """Get SUI balance for address"""
+    def get_raw_sui_balance(self, address: str) -> int:
+        """Get SUI balance for address in MIST"""
         try:
-            result = self.client.execute_query_node(
-                with_node=self.client.get_address_owner_balance(
-                    owner=address
-                )
-            )
-            if result.is_ok():
-                balance_data = result.result_data
-                if hasattr(balance_data, 'total_balance'):
-                    return int(balance_data.total_balance) / Config.MIST_PER_SUI
-                # Fallback to summing coin objects
-                coins_result = self.client.execute_query_node(
-                    with_node=self.client.get_coins(
-                        coin_type="0x2::sui::SUI",
-                        owner=address
-                    )
-                )
-                if coins_result.is_ok() and hasattr(coins_result.result_data, 'data'):
-                    total = sum(int(coin.balance) for coin in coins_result.result_data.data if hasattr(coin, 'balance'))
-                    return total / Config.MIST_PER_SUI
-            return 0.0
+            return self.cache.get(('balance', address), address,
+                                  lambda: self._fetch_sui_balance(address))
         except Exception as e:
-            print(f"Error getting SUI balance: {str(e)}")
-            return 0.0
+            log(f"Error getting SUI balance: {str(e)}", event='error', error=str(e))
+            return 0
+    
+    def _fetch_sui_balance(self, address: str) -> int:
+        result = self.pool.read(lambda client: client.execute_query_node(
+            with_node=client.get_address_owner_balance(
+                owner=address
+            )
+        ))
+        if not result.is_ok():
+            raise RuntimeError(result.result_string)
+        balance_data = result.result_data
+        if hasattr(balance_data, 'total_balance'):
+            return int(balance_data.total_balance)
+        # Fallback to summing coin objects
+        coins = self.get_coins(address, "0x2::sui::SUI")
+        return sum(int(coin.balance) for coin in coins if hasattr(coin, 'balance'))
     
     def get_coins(self, address: str, coin_type: str) -> List:
-        """Get coins of specific type for address"""
+        """Get coins of specific type for address (the list is shared, do not modify it)"""
+        key = ('coins', address, coin_type)
         try:
-            result = self.client.execute_query_node(
-                with_node=self.client.get_coins(
-                    coin_type=coin_type,
-                    owner=address
-                )
-            )
-            if result.is_ok() and hasattr(result.result_data, 'data'):
-                return result.result_data.data
-            return []
+            return self.cache.get(key, address, lambda: self._fetch_coins(address, coin_type))
         except Exception as e:
             # Handle rate limiting
             if '429' in str(e):
-                print(f"  ⚠️ Rate limited! Waiting {Config.RATE_LIMIT_COOLDOWN}s...")
-                time.sleep(Config.RATE_LIMIT_COOLDOWN)
+                log(f"  ⚠️ Rate limited! Waiting {Config.RATE_LIMIT_COOLDOWN}s...", event='rate_limited',
+                    seconds=Config.RATE_LIMIT_COOLDOWN)
+                with trace_span('sleep', 'sleep', reason='Rate limit'):
+                    get_clock().sleep_sync(Config.RATE_LIMIT_COOLDOWN)
                 try:
-                    result = self.client.execute_query_node(
-                        with_node=self.client.get_coins(
-                            coin_type=coin_type,
-                            owner=address
-                        )
-                    )
-                    if result.is_ok() and hasattr(result.result_data, 'data'):
-                        return result.result_data.data
+                    return self.cache.get(key, address, lambda: self._fetch_coins(address, coin_type))
                 except Exception as retry_error:
-                    print(f"  ✗ Still failed: {str(retry_error)}")
+                    log(f"  ✗ Still failed: {str(retry_error)}", event='error', error=str(retry_error))
             return []
     
-    def get_token_balance(self, address: str, token_type: str) -> float:
-        """Get balance for specific token type"""
+    def _fetch_coins(self, address: str, coin_type: str) -> List:
+        result = self.pool.read(lambda client: client.execute_query_node(
+            with_node=client.get_coins(
+                coin_type=coin_type,
+                owner=address
+            )
+        ))
+        if not result.is_ok():
+            raise RuntimeError(result.result_string)
+        return result.result_data.data if hasattr(result.result_data, 'data') else []
+    
+    def get_raw_balance(self, address: str, token_type: str) -> int:
+        """Get balance for specific token type in base units"""
         try:
             if token_type == Config.SUI_TYPE:
-                return self.get_sui_balance(address)
+                return self.get_raw_sui_balance(address)
             else:
                 coins = self.get_coins(address, token_type)
-                total = sum(int(coin.balance) for coin in coins)
-                return total / Config.DECIMALS
+                return sum(int(coin.balance) for coin in coins)
         except Exception as e:
-            print(f"Error getting token balance: {str(e)}")
-            return 0.0
+            log(f"Error getting token balance: {str(e)}", event='error', error=str(e))
+            return 0
+    
+    def fetch_raw_balance(self, address: str, token_type: str) -> int:
+        """Like get_raw_balance, but raises on read errors instead of reporting 0"""
+        if token_type == Config.SUI_TYPE:
+            return self.cache.get(('balance', address), address, lambda: self._fetch_sui_balance(address))
+        coins = self.cache.get(('coins', address, token_type), address,
+                               lambda: self._fetch_coins(address, token_type))
+        return sum(int(coin.balance) for coin in coins)
+
+
+class WalletRegistry:
+    """Keeps derived wallets in memory and reloads the key file only when it changes
+    
+    Each keypair and address is derived once. On reload the file's mtime/size
+    is checked first, then its hash, and only keys added since the last load
+    are derived; removed keys are dropped. With a shard, only the keys in that
+    shard's slice are derived.
+    """
+    
+    def __init__(self, wallet_manager: WalletManager, filename: str = Config.PRIVATE_KEYS_FILE,
+                 shard: Optional[Tuple[int, int]] = None):
+        self.wallet_manager = wallet_manager
+        self.filename = filename
+        self.shard = shard
+        self.private_keys: List[str] = []
+        self.shard_keys: List[Tuple[int, str]] = []
+        self._wallets: Dict[str, Optional[Tuple[any, str]]] = {}
+        self._file_stat: Optional[Tuple[int, int]] = None
+        self._file_hash: Optional[str] = None
+    
+    def reload(self) -> bool:
+        """Reload the key file if it changed
+        
+        Returns:
+            True if the set of keys changed
+        """
+        filepath = Path(self.filename)
+        if not filepath.exists():
+            log(f"❌ File {self.filename} not found!", event='error', path=self.filename)
+            self._apply([])
+            self._file_stat = self._file_hash = None
+            return True
+        
+        try:
+            stat = filepath.stat()
+            file_stat = (stat.st_mtime_ns, stat.st_size)
+            if file_stat == self._file_stat:
+                return False
+            
+            data = filepath.read_bytes()
+            file_hash = hashlib.sha256(data).hexdigest()
+            self._file_stat = file_stat
+            if file_hash == self._file_hash:
+                return False
+            
+            keys = parse_private_keys(data.decode().splitlines())
+        except Exception as e:
+            log(f"Error reading {self.filename}: {str(e)}", event='error', path=self.filename, error=str(e))
+            return False
+        
+        self._file_hash = file_hash
+        return self._apply(keys)
+    
+    def _apply(self, keys: List[str]) -> bool:
+        """Diff the new key list against the loaded one and derive only new keys"""
+        shard_keys = shard_private_keys(keys, self.shard)
+        new_keys = {key for _, key in shard_keys}
+        removed = [key for key in self._wallets if key not in new_keys]
+        for key in removed:
+            del self._wallets[key]
+        
+        added = 0
+        for _, key in shard_keys:
+            if key not in self._wallets:
+                self._wallets[key] = self.wallet_manager.import_wallet(key)
+                added += 1
+        
+        changed = keys != self.private_keys
+        self.private_keys = keys
+        self.shard_keys = shard_keys
+        if added or removed:
+            log(f"🔑 Key file loaded: +{added} / -{len(removed)} wallets ({len(self._wallets)} total)",
+                event='keys_loaded', added=added, removed=len(removed), total=len(self._wallets))
+        return changed
+    
+    def get_wallet(self, private_key: str) -> Optional[Tuple[any, str]]:
+        """Get the cached (keypair, address) for a key, or None if it failed to import"""
+        return self._wallets.get(private_key)
 
 
 class FaucetManager:
@@ -307,6 +1415,8 @@ class FaucetManager:
     
     def request_sui_faucet(self, address: str, proxy: Optional[str] = None) -> Dict:
         """Request SUI from testnet faucet"""
+        import requests
+        
         try:
             payload = {
                 'FixedAmountRequest': {
@@ -317,13 +1427,14 @@ class FaucetManager:
             headers = {'Content-Type': 'application/json'}
             proxies = {'http': proxy, 'https': proxy} if proxy else None
             
-            response = requests.post(
-                Config.SUI_FAUCET_URL,
-                json=payload,
-                headers=headers,
-                proxies=proxies,
-                timeout=30
-            )
+            with trace_span('sui_faucet_request', 'io', proxy=bool(proxy)):
+                response = requests.post(
+                    Config.SUI_FAUCET_URL,
+                    json=payload,
+                    headers=headers,
+                    proxies=proxies,
+                    timeout=30
+                )
             
             if response.status_code == 429:
                 return {'success': False, 'error': 'Rate limit', 'isRateLimit': True}
@@ -344,35 +1455,38 @@ class FaucetManager:
     
     async def ensure_sui_faucet(self, address: str, proxy: Optional[str] = None) -> bool:
         """Ensure wallet has minimum SUI balance"""
-        print(f"\n💧 Ensuring wallet has minimum {Config.MIN_SUI_BALANCE} SUI...")
+        log(f"\n💧 Ensuring wallet has minimum {Config.MIN_SUI_BALANCE} SUI...")
         
+        min_balance = int(Config.MIN_SUI_BALANCE * Config.MIST_PER_SUI)
         for attempt in range(1, Config.SUI_FAUCET_RETRIES + 1):
-            current_balance = self.wallet_manager.get_sui_balance(address)
-            print(f"  📊 Balance: {current_balance:.6f} SUI ({attempt}/{Config.SUI_FAUCET_RETRIES})")
+            current_balance = self.wallet_manager.get_raw_sui_balance(address)
+            log(f"  📊 Balance: {current_balance / Config.MIST_PER_SUI:.6f} SUI ({attempt}/{Config.SUI_FAUCET_RETRIES})",
+                event='sui_balance', raw=current_balance, attempt=attempt)
             
-            if current_balance >= Config.MIN_SUI_BALANCE:
-                print(f"  ✓ Balance sufficient!")
+            if current_balance >= min_balance:
+                log(f"  ✓ Balance sufficient!")
                 return True
             
-            print(f"  💧 Requesting SUI Faucet...")
+            log(f"  💧 Requesting SUI Faucet...", event='faucet_request', attempt=attempt)
             result = self.request_sui_faucet(address, proxy)
             
             if result['success']:
-                print(f"  ✓ Faucet success!")
+                log(f"  ✓ Faucet success!", event='faucet_success')
+                self.wallet_manager.invalidate(address)
                 await delay(3, 'Balance update:')
             else:
-                print(f"  ✗ Failed: {result['error']}")
+                log(f"  ✗ Failed: {result['error']}", event='faucet_failed', error=result['error'])
                 if result.get('isRateLimit'):
                     await delay(get_random_delay(3, 10), 'Rate limit:')
                 elif attempt < Config.SUI_FAUCET_RETRIES:
                     await delay(get_random_delay(3, 10), 'Retry:')
         
-        final_balance = self.wallet_manager.get_sui_balance(address)
-        if final_balance >= Config.MIN_SUI_BALANCE:
-            print(f"  ✓ Balance sufficient!")
+        final_balance = self.wallet_manager.get_raw_sui_balance(address)
+        if final_balance >= min_balance:
+            log(f"  ✓ Balance sufficient!")
             return True
         
-        print(f"  ✗ Failed after {Config.SUI_FAUCET_RETRIES} attempts")
+        log(f"  ✗ Failed after {Config.SUI_FAUCET_RETRIES} attempts", event='faucet_exhausted')
         return False
 
 
@@ -388,65 +1502,409 @@ def calculate_safe_deposit_amount(current_balance: float, token_type: str) -> in
     return max(0, int(safe_deposit))
 
 
-def calculate_health_factor(address: str, wallet_manager: WalletManager) -> float:
-    """Calculate real-time health factor"""
-    try:
-        gr_balance = wallet_manager.get_token_balance(address, Config.GR_TYPE)
-        usdc_balance = wallet_manager.get_token_balance(address, Config.USDC_TYPE)
-        gusd_balance = wallet_manager.get_token_balance(address, Config.GUSD_TYPE)
-        
-        gr_value = gr_balance * HealthFactorConfig.PRICE['GR']
-        usdc_value = usdc_balance * HealthFactorConfig.PRICE['USDC']
-        total_collateral = gr_value + usdc_value
-        
-        borrow_value = gusd_balance * HealthFactorConfig.PRICE['GUSD']
-        
-        health_factor = total_collateral / borrow_value if borrow_value > 0 else float('inf')
-        
-        status = '✅ VERY SAFE'
-        if health_factor < 1.5:
-            status = '🚨 CRITICAL!'
-        elif health_factor < 2.0:
-            status = '⚠️ WARNING'
-        elif health_factor < 10:
-            status = '✅ SAFE'
-        
-        print(f"\n📊 ═══════════════════════════════════════════════")
-        print(f"   REAL-TIME HEALTH FACTOR SNAPSHOT")
-        print(f"   ═══════════════════════════════════════════════")
-        print(f"   Collateral: GR {gr_balance:.2f} (${gr_value:.2f}) + USDC {usdc_balance:.2f} (${usdc_value:.2f})")
-        print(f"   Total Collateral: ${total_collateral:.2f}")
-        print(f"   Borrow: GUSD {gusd_balance:.2f} (${borrow_value:.2f})")
-        print(f"   ───────────────────────────────────────────────")
-        print(f"   Health Factor: {'∞' if health_factor == float('inf') else f'{health_factor:.2f}'} {status}")
-        print(f"   ═══════════════════════════════════════════════\n")
-        
-        return health_factor
-    except Exception as e:
-        print(f"Error calculating health factor: {str(e)}")
-        return float('inf')
+def compute_health_factor(address: str, wallet_manager: WalletManager) -> Tuple[float, Dict]:
+    """Compute the health factor without printing
+    
+    Raises on read errors: a missing balance must not pass for a zero one.
+    
+    Returns:
+        Tuple of (health_factor, balances by token name in token units)
+    """
+    balances = {
+        name: wallet_manager.fetch_raw_balance(address, COIN_TYPES[COIN_INDEX[name]]) / COIN_DECIMALS[COIN_INDEX[name]]
+        for name in ('GR', 'USDC', 'GUSD')
+    }
+    
+    total_collateral = (balances['GR'] * HealthFactorConfig.PRICE['GR'] +
+                        balances['USDC'] * HealthFactorConfig.PRICE['USDC'])
+    borrow_value = balances['GUSD'] * HealthFactorConfig.PRICE['GUSD']
+    
+    health_factor = total_collateral / borrow_value if borrow_value > 0 else float('inf')
+    return health_factor, balances
+
+
+def health_factor_status(health_factor: float) -> str:
+    """Human readable status for a health factor"""
+    if health_factor < HealthFactorConfig.CRITICAL:
+        return '🚨 CRITICAL!'
+    elif health_factor < HealthFactorConfig.WARNING:
+        return '⚠️ WARNING'
+    elif health_factor < HealthFactorConfig.SAFE:
+        return '✅ SAFE'
+    return '✅ VERY SAFE'
+
+
+class HealthMonitor:
+    """Background health factor monitor driven by chain activity
+    
+    Only wallets marked dirty are recomputed: the bot marks a wallet after
+    its own transactions, and periodic event polling of the lending packages
+    marks wallets that sent transactions there. Health factors are kept in a
+    min-heap so the riskiest wallets are always at hand, and an alert fires
+    when a wallet crosses into CRITICAL.
+    """
+    
+    def __init__(self, wallet_manager: WalletManager, interval: int = HealthFactorConfig.MONITOR_INTERVAL):
+        self.wallet_manager = wallet_manager
+        self.interval = interval
+        self.health: Dict[str, float] = {}
+        self.dirty: set = set()
+        self._tracked: set = set()
+        self._heap: List[Tuple[float, str]] = []
+        self._last_checkpoint: Optional[int] = None
+    
+    def track(self, addresses):
+        """Set the wallets to monitor; new wallets are computed on the next pass"""
+        addresses = set(addresses)
+        for address in self._tracked - addresses:
+            self.health.pop(address, None)
+            self.dirty.discard(address)
+        self.dirty |= addresses - self._tracked
+        self._tracked = addresses
+    
+    def mark_dirty(self, address: str):
+        """Mark a wallet whose balances changed (e.g. after its own transaction)"""
+        self.wallet_manager.invalidate(address)
+        if address in self._tracked:
+            self.dirty.add(address)
+    
+    def poll_events(self):
+        """Mark tracked wallets that emitted lending events since the last poll"""
+        import pysui.sui.sui_pgql.pgql_query as qn
+        
+        pool = self.wallet_manager.pool
+        result = pool.read(lambda client: client.execute_query_node(
+            with_node=qn.GetLatestCheckpointSequence()
+        ))
+        if not result.is_ok():
+            return
+        latest = int(result.result_data.sequence_number)
+        
+        if self._last_checkpoint is not None and latest > self._last_checkpoint:
+            for package in dict.fromkeys(HealthFactorConfig.MONITOR_PACKAGES):
+                event_filter = {'module': package, 'afterCheckpoint': self._last_checkpoint}
+                next_page = None
+                while True:
+                    result = pool.read(lambda client: client.execute_query_node(
+                        with_node=qn.GetEvents(event_filter=event_filter, next_page=next_page)
+                    ))
+                    if not result.is_ok():
+                        break
+                    for event in result.result_data.data:
+                        sender = (event.sender or {}).get('address')
+                        if sender:
+                            self.mark_dirty(sender)
+                    next_page = result.result_data.next_cursor
+                    if not next_page or not next_page.hasNextPage:
+                        break
+        self._last_checkpoint = latest
+    
+    async def recompute(self) -> List[str]:
+        """Recompute health of dirty wallets
+        
+        The reads run in a worker thread one wallet at a time, so the event
+        loop (scheduler and wallet processing) keeps running during a pass.
+        A wallet whose reads fail stays dirty and is retried on the next pass.
+        
+        Returns:
+            Addresses that crossed into CRITICAL during this pass
+        """
+        crossed = []
+        for address in list(self.dirty):
+            self.dirty.discard(address)
+            try:
+                health_factor, _ = await asyncio.to_thread(compute_health_factor, address, self.wallet_manager)
+            except Exception as e:
+                log(f"Error calculating health factor: {str(e)}", event='error', address=address, error=str(e))
+                if address in self._tracked:
+                    self.dirty.add(address)
+                continue
+            if address not in self._tracked:
+                continue
+            
+            previous = self.health.get(address)
+            self.health[address] = health_factor
+            heapq.heappush(self._heap, (health_factor, address))
+            if len(self._heap) > 2 * len(self.health) + 16:
+                self._heap = [(value, key) for key, value in self.health.items()]
+                heapq.heapify(self._heap)
+            
+            if (health_factor < HealthFactorConfig.CRITICAL and
+                    (previous is None or previous >= HealthFactorConfig.CRITICAL)):
+                crossed.append(address)
+                self.alert(address, health_factor, previous)
+        return crossed
+    
+    def alert(self, address: str, health_factor: float, previous: Optional[float]):
+        """Report a wallet crossing into CRITICAL"""
+        was = 'new' if previous is None else ('∞' if previous == float('inf') else f'{previous:.2f}')
+        log(f"\n🚨 HEALTH ALERT: {address[:12]}...{address[-8:]} "
+            f"health factor {health_factor:.2f} (was {was}) {health_factor_status(health_factor)}\n",
+            event='health_alert', address=address, health_factor=health_factor, previous=previous)
+    
+    def lowest(self, count: int = 5) -> List[Tuple[float, str]]:
+        """Wallets with the lowest health factors, dropping stale heap entries"""
+        result = []
+        while self._heap and len(result) < count:
+            health_factor, address = heapq.heappop(self._heap)
+            if self.health.get(address) == health_factor and (health_factor, address) not in result:
+                result.append((health_factor, address))
+        for entry in result:
+            heapq.heappush(self._heap, entry)
+        return result
+    
+    async def run(self):
+        """Poll for activity and recompute changed wallets until cancelled"""
+        while True:
+            try:
+                await asyncio.to_thread(self.poll_events)
+            except Exception as e:
+                log(f"⚠️ Health monitor event poll failed: {str(e)}", event='warning', error=str(e))
+            await self.recompute()
+            await get_clock().sleep(self.interval)
 
 
-def print_balance_report(address: str, balance_before: Dict, balance_after: Dict):
+def print_balance_report(address: str, balance_before: 'BalanceSnapshot', balance_after: 'BalanceSnapshot'):
     """Print balance comparison report"""
     if not balance_before or not balance_after:
         return
     
-    print(f"\n{'═' * 70}")
-    print(f"  💰 BALANCE TRACKING REPORT")
-    print(f"{'═' * 70}")
-    print(f"  Address: {address[:12]}...{address[-8:]}")
-    print(f"{'─' * 70}")
-    print(f"  Token │      Before      │       After      │     Change")
-    print(f"{'─' * 70}")
+    lines = [
+        f"\n{'═' * 70}",
+        f"  💰 BALANCE TRACKING REPORT",
+        f"{'═' * 70}",
+        f"  Address: {address[:12]}...{address[-8:]}",
+        f"{'─' * 70}",
+        f"  Token │      Before      │       After      │     Change",
+        f"{'─' * 70}",
+    ]
+    
+    for index, token in enumerate(COIN_NAMES):
+        before = balance_before.raw[index]
+        after = balance_after.raw[index]
+        decimals = COIN_DECIMALS[index]
+        lines.append(f"  {token:5} │ {format_units(before, decimals):>15} │ {format_units(after, decimals):>15} │ "
+                     f"{format_units(after - before, decimals):>12}")
+    
+    lines.append(f"{'═' * 70}\n")
+    log_banner(lines, event='balance_report', address=address,
+               before=balance_before.to_dict(), after=balance_after.to_dict())
+
+
+def print_day_statistics(day_count: int, run_start_time: datetime, run_end_time: datetime,
+                         wallet_count: int, total_stats: Dict, label: str = ''):
+    """Print end-of-day statistics"""
+    process_duration = int((run_end_time - run_start_time).total_seconds() / 60)
+    
+    # Statistics are a report, not decoration: logged as a plain message so quiet mode keeps them
+    log('\n'.join([
+        f"\n{'═' * 70}",
+        f"  ✅ DAY #{day_count} COMPLETED!{label}",
+        f"{'═' * 70}",
+        f"  🟢 Start: {run_start_time.strftime('%Y-%m-%d %H:%M:%S')}",
+        f"  🔴 End: {run_end_time.strftime('%Y-%m-%d %H:%M:%S')}",
+        f"  ⏱️ Duration: {process_duration} minutes",
+        f"{'─' * 70}",
+        '  📊 STATISTICS:',
+        f"    🎯 Total: {wallet_count} | ✓ {total_stats['success']} | ✗ {total_stats['failed']}",
+        f"    💰 XAUM: {total_stats['xaumClaims']}/{wallet_count * Config.XAUM_CLAIM_COUNT} | "
+        f"💵 USDC: {total_stats['usdcClaims']}/{wallet_count * Config.USDC_CLAIM_COUNT}",
+        f"{'═' * 70}\n"
+    ]), event='day_report', day=day_count, wallets=wallet_count, stats=total_stats,
+        duration_s=round((run_end_time - run_start_time).total_seconds(), 1))
+
+
+# ============================================
+# SCHEDULER
+# ============================================
+
+class WalletScheduler:
+    """Per-wallet due times kept in a min-heap and persisted across restarts
+    
+    Every wallet gets a fixed slot within the period (its position in the key
+    file), so wallets are spread evenly over the day and each one runs exactly
+    once per period regardless of how long the others take.
+    """
+    
+    def __init__(self, filename: str = Config.SCHEDULE_FILE, period: int = Config.SCHEDULE_PERIOD):
+        self.filename = filename
+        self.period = period
+        self.anchor: Optional[float] = None
+        self.due: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._last_save: Optional[float] = None
+    
+    def load(self, now: float):
+        """Load persisted due times; runs missed by more than the grace are skipped"""
+        filepath = Path(self.filename)
+        if filepath.exists():
+            try:
+                with open(filepath, 'r') as f:
+                    data = json.load(f)
+                self.anchor = float(data['anchor'])
+                self.due = {address: float(due) for address, due in data['due'].items()}
+            except Exception as e:
+                log(f"⚠️ Ignoring invalid schedule {self.filename}: {str(e)}", event='warning',
+                    path=self.filename, error=str(e))
+                self.due = {}
+        
+        if self.anchor is None:
+            self.anchor = now
+        
+        for address, due in self.due.items():
+            if due < now - Config.SCHEDULE_CATCHUP_GRACE:
+                self.due[address] = self._next_slot(due, now)
+        self._rebuild_heap()
+    
+    def save(self):
+        # Compact output: the C encoder is only used without indentation
+        write_json_atomic(Path(self.filename), {'anchor': self.anchor, 'due': self.due}, indent=None)
+        self._last_save = get_clock().monotonic()
+    
+    def maybe_save(self):
+        """Save if the last save is older than SCHEDULE_SAVE_INTERVAL
+        
+        A wallet completed since the last save may run once more after a
+        crash, which is harmless; rewriting the file per wallet is not free
+        with thousands of wallets.
+        """
+        if (self._last_save is None
+                or get_clock().monotonic() - self._last_save >= Config.SCHEDULE_SAVE_INTERVAL):
+            self.save()
     
-    for token in ['GR', 'SUI', 'USDC', 'GUSD', 'XAUM']:
-        before = balance_before.get(token, 0)
-        after = balance_after.get(token, 0)
-        change = after - before
-        print(f"  {token:5} │ {before:15.6f} │ {after:15.6f} │ {change:12.6f}")
+    def _next_slot(self, due: float, now: float) -> float:
+        """First time at or after now with the same phase as due"""
+        if due >= now:
+            return due
+        periods = int((now - due) // self.period) + 1
+        return due + periods * self.period
+    
+    def _rebuild_heap(self):
+        self._heap = [(due, address) for address, due in self.due.items()]
+        heapq.heapify(self._heap)
+    
+    def sync(self, slots: List[Tuple[str, float]], now: float):
+        """Add new wallets at their slot and drop wallets no longer in the key file
+        
+        Args:
+            slots: (address, fraction) pairs, fraction in [0, 1) being the
+                wallet's position within the period
+            now: Current timestamp
+        """
+        addresses = {address for address, _ in slots}
+        removed = [address for address in self.due if address not in addresses]
+        for address in removed:
+            del self.due[address]
+        
+        added = False
+        for address, fraction in slots:
+            if address not in self.due:
+                self.due[address] = self._next_slot(self.anchor + fraction * self.period, now)
+                heapq.heappush(self._heap, (self.due[address], address))
+                added = True
+        
+        if removed:
+            self._rebuild_heap()
+        if added or removed:
+            self.save()
+    
+    def peek(self) -> Optional[Tuple[float, str]]:
+        """Earliest (due, address), skipping stale heap entries"""
+        while self._heap:
+            due, address = self._heap[0]
+            if self.due.get(address) == due:
+                return due, address
+            heapq.heappop(self._heap)
+        return None
     
-    print(f"{'═' * 70}\n")
+    def complete(self, address: str, now: float):
+        """Reschedule a wallet one period after its slot (skipping missed slots)"""
+        due = self.due.get(address)
+        if due is None:
+            return
+        self.due[address] = self._next_slot(due + self.period, now)
+        heapq.heappush(self._heap, (self.due[address], address))
+        self.maybe_save()
+    
+    def day_of(self, due: float) -> int:
+        """1-based day number of the period window containing due"""
+        return int((due - self.anchor) // self.period) + 1
+
+
+# ============================================
+# TRANSACTION LEDGER
+# ============================================
+
+class TransactionLedger:
+    """Append-only record of submitted transactions, keyed by digest
+    
+    The digest is computed locally from the signed bytes before submission,
+    so a transaction whose submission timed out or threw can be looked up
+    on chain instead of being treated as failed. Each status change is
+    appended as a JSON line; on load, digests whose last status is still
+    'pending' or 'unknown' (e.g. after a crash) are kept for resolution
+    until they land or are dropped after TX_PENDING_MAX_AGE. The file is
+    compacted to the unresolved entries on load and after each day.
+    """
+    
+    FINAL = ('success', 'failure', 'dropped')
+    
+    def __init__(self, filename: str = Config.TX_LEDGER_FILE):
+        self.filename = filename
+        self.pending: Dict[str, Dict] = {}
+        self._file = None
+    
+    def load(self):
+        """Collect unresolved digests from a previous run and compact the file"""
+        filepath = Path(self.filename)
+        if not filepath.is_file():
+            return
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if entry['status'] in self.FINAL:
+                        self.pending.pop(entry['digest'], None)
+                    else:
+                        self.pending[entry['digest']] = entry
+        except (ValueError, KeyError) as e:
+            log(f"⚠️ Ignoring corrupt transaction ledger {self.filename}: {str(e)}", event='warning',
+                path=self.filename, error=str(e))
+            return
+        self.compact()
+    
+    def compact(self):
+        """Rewrite the file with only the unresolved entries (atomically)"""
+        filepath = Path(self.filename)
+        if not filepath.is_file():
+            return
+        self.close()
+        tmp_path = filepath.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(entry) + '\n' for entry in self.pending.values())
+        os.replace(tmp_path, filepath)
+    
+    def record(self, digest: str, address: str, label: str, status: str, **fields):
+        """Append a status change for a transaction"""
+        now = round(get_clock().time(), 3)
+        entry = {'digest': digest, 'address': address, 'label': label, 'status': status, 'ts': now,
+                 'submitted': self.pending.get(digest, {}).get('submitted', now)}
+        entry.update(fields)
+        if status in self.FINAL:
+            self.pending.pop(digest, None)
+        else:
+            self.pending[digest] = entry
+        
+        if self._file is None:
+            self._file = open(self.filename, 'a', buffering=1, encoding='utf-8')
+        self._file.write(json.dumps(entry) + '\n')
+    
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
 
 
 # ============================================
@@ -456,45 +1914,274 @@ def print_balance_report(address: str, balance_before: Dict, balance_after: Dict
 class CreekFinanceBot:
     """Main bot class for Creek Finance operations"""
     
-    def __init__(self):
+    def __init__(self, shard: Optional[Tuple[int, int]] = None, pool: Optional[ClientPool] = None,
+                 wallet_manager: Optional[WalletManager] = None,
+                 faucet_manager: Optional[FaucetManager] = None,
+                 key_file: str = Config.PRIVATE_KEYS_FILE, ledger_file: Optional[str] = None,
+                 monitor_health: bool = True):
+        """
+        Args:
+            shard: (index, count) of the key file slice this bot runs, if sharded
+            pool: GraphQL client pool (default: built from the pysui config)
+            wallet_manager: Wallet manager (default: one backed by the pool)
+            faucet_manager: Faucet manager (default: one backed by the wallet manager)
+            key_file: Private key file to load wallets from
+            ledger_file: Transaction ledger file (default: Config.TX_LEDGER_FILE, per shard)
+            monitor_health: Whether to run the background health factor monitor
+        """
+        self.pool = pool or self._create_pool()
+        self.wallet_manager = wallet_manager or WalletManager(self.pool)
+        self.wallet_registry = WalletRegistry(self.wallet_manager, key_file, shard=shard)
+        self.faucet_manager = faucet_manager or FaucetManager(self.wallet_manager)
+        # The monitor reads from a worker thread, so it gets its own clients and cache
+        self.health_monitor = HealthMonitor(WalletManager(self.pool.fork())) if monitor_health else None
+        if ledger_file is None:
+            ledger_file = shard_output_path(Config.TX_LEDGER_FILE, shard) if shard else Config.TX_LEDGER_FILE
+        self.tx_ledger = TransactionLedger(ledger_file)
+        self.tx_ledger.load()
+    
+    @staticmethod
+    def _create_pool() -> ClientPool:
+        """Build the GraphQL client pool from the pysui configuration"""
         # Initialize SUI GraphQL client for pysui 0.92+
         # NOTE: pysui 0.92+ has complex configuration requirements.
         # The recommended approach is to use sui CLI which auto-generates proper config.
         # For this bot, we'll attempt to use a simple config if available.
+        from pysui import PysuiConfiguration
         
         try:
             # Try to use existing configuration with default GraphQL group
             pysui_config = PysuiConfiguration(group_name=PysuiConfiguration.SUI_GQL_RPC_GROUP)
-            print(f"✅ Using pysui config group: {pysui_config.active_group.group_name}")
+            log(f"✅ Using pysui config group: {pysui_config.active_group.group_name}", event='config')
         except (ValueError, FileNotFoundError, KeyError) as e:
             # If config doesn't exist or is invalid, provide helpful error message
-            print("\n" + "="*70)
-            print("❌ pysui 0.92+ Configuration Required")
-            print("="*70)
-            print("\npysui 0.92+ requires a properly formatted configuration file.")
-            print("The easiest way to set this up is using the SUI CLI:")
-            print("\n1. Install SUI CLI: https://docs.sui.io/guides/developer/getting-started/sui-install")
-            print("2. Run: sui client")
-            print("3. This will create ~/.pysui/PysuiConfig.json automatically")
-            print("\nAlternatively, you can create the config manually,")
-            print("but the format is complex. See README_PYTHON.md for details.")
-            print("\nFor now, this bot uses deprecated JSON RPC methods as fallback.")
-            print("="*70 + "\n")
+            log_event('config_error', "\n".join([
+                "\n" + "="*70,
+                "❌ pysui 0.92+ Configuration Required",
+                "="*70,
+                "\npysui 0.92+ requires a properly formatted configuration file.",
+                "The easiest way to set this up is using the SUI CLI:",
+                "\n1. Install SUI CLI: https://docs.sui.io/guides/developer/getting-started/sui-install",
+                "2. Run: sui client",
+                "3. This will create ~/.pysui/PysuiConfig.json automatically",
+                "\nAlternatively, you can create the config manually,",
+                "but the format is complex. See README_PYTHON.md for details.",
+                "\nFor now, this bot uses deprecated JSON RPC methods as fallback.",
+                "="*70 + "\n"
+            ]), error=str(e))
             raise RuntimeError("pysui configuration not available") from e
         
-        # Initialize GraphQL client
-        self.client = SyncGqlClient(pysui_config=pysui_config)
+        # Initialize GraphQL client pool
+        pool = ClientPool(pysui_config, Config.GRAPHQL_ENDPOINTS)
+        log(f"🌐 GraphQL endpoints: {', '.join(endpoint.url for endpoint in pool.endpoints)}",
+            event='config', endpoints=[endpoint.url for endpoint in pool.endpoints])
+        return pool
+    
+    def on_transaction(self, address: str):
+        """Hook for a wallet's own transaction effects"""
+        self.wallet_manager.invalidate(address)
+        if self.health_monitor:
+            self.health_monitor.mark_dirty(address)
+    
+    def preflight(self) -> bool:
+        """Fail fast on bad keys or a bad deployment before the wallet loop
+    
+        Validates every key of this shard and checks that all configured
+        objects and packages exist using one batched multi-object query.
+    
+        Returns:
+            True if the bot is ready to run
+        """
+        import pysui.sui.sui_pgql.pgql_query as qn
+    
+        started = get_clock().monotonic()
+        log(f"\n🛫 Preflight checks...", event='preflight_start')
+        ok = True
+    
+        # Keys
+        self.wallet_registry.reload()
+        private_keys = self.wallet_registry.shard_keys
+        invalid = [index for index, key in private_keys
+                   if not self.wallet_registry.get_wallet(key)]
+        if not self.wallet_registry.private_keys:
+            log(f"  ✗ No private keys found in {self.wallet_registry.filename}", event='preflight_check', ok=False)
+            ok = False
+        elif invalid:
+            log(f"  ✗ {len(invalid)}/{len(private_keys)} keys failed to import: "
+                f"{', '.join(f'#{index}' for index in invalid)}", event='preflight_check', ok=False)
+            ok = False
+        else:
+            log(f"  ✓ {len(private_keys)} keys valid", event='preflight_check', ok=True)
+    
+        # Configured objects and packages, in a single query
+        expected = {}
+        for name in Config.PREFLIGHT_OBJECTS:
+            expected.setdefault(normalize_object_id(getattr(Config, name)), []).append(name)
+    
+        try:
+            # Keep the raw response: missing objects come back as null entries,
+            # which pysui's ObjectReadsGQL encoder cannot parse
+            result = self.pool.read(lambda client: client.execute_query_node(
+                with_node=qn.GetMultipleObjects(object_ids=list(expected)),
+                encode_fn=lambda data: data
+            ))
+            if not result.is_ok():
+                log(f"  ✗ Object query failed: {result.result_string}", event='preflight_check', ok=False)
+                ok = False
+            else:
+                found = {normalize_object_id(obj['object_id'])
+                         for obj in result.result_data.get('multiGetObjects') or [] if obj}
+                missing = [name for object_id, names in expected.items()
+                           if object_id not in found for name in names]
+                if missing:
+                    for name in missing:
+                        log(f"  ✗ Config.{name} not found on chain: {getattr(Config, name)}",
+                            event='preflight_check', ok=False)
+                    ok = False
+                else:
+                    log(f"  ✓ {len(Config.PREFLIGHT_OBJECTS)} configured objects found",
+                        event='preflight_check', ok=True)
+        except Exception as e:
+            log(f"  ✗ Endpoint unreachable: {str(e)}", event='preflight_check', ok=False)
+            ok = False
+    
+        elapsed = get_clock().monotonic() - started
+        log(f"  {'✅ Preflight passed' if ok else '❌ Preflight failed'} in {elapsed:.2f}s\n",
+            event='preflight_end', ok=ok, latency_ms=round(elapsed * 1000, 1))
+        return ok
+    
+    def print_wallet_balances(self):
+        """Print current token balances of every wallet in this shard"""
+        self.wallet_registry.reload()
+        private_keys = self.wallet_registry.shard_keys
+    
+        lines = [
+            f"\n{'═' * 70}",
+            f"  💰 WALLET BALANCES ({len(private_keys)} wallets)",
+            f"{'═' * 70}"
+        ]
+        for index, private_key in private_keys:
+            wallet = self.wallet_registry.get_wallet(private_key)
+            if not wallet:
+                lines.append(f"  #{index}: ❌ invalid key")
+                continue
+            _, address = wallet
+            snapshot = BalanceSnapshot.capture(self.wallet_manager, address)
+            balances = ', '.join(
+                f"{name}: {format_units(snapshot.raw[index], COIN_DECIMALS[index], 4)}"
+                for index, name in enumerate(COIN_NAMES)
+            )
+            lines.append(f"  #{index} {address[:12]}...{address[-8:]}  {balances}")
+        lines.append(f"{'═' * 70}\n")
+        # Requested output, so it is kept in quiet mode
+        log_event('wallet_balances', '\n'.join(lines))
+    
+    def lookup_transaction(self, digest: str) -> Optional[str]:
+        """Look up the on-chain outcome of a transaction by digest
+        
+        Returns:
+            'success' or 'failure' if it was executed, None if it is not found (yet)
+        """
+        import pysui.sui.sui_pgql.pgql_query as qn
+        
+        try:
+            result = self.pool.read(lambda client: client.execute_query_node(
+                with_node=qn.GetTx(digest=digest)
+            ))
+        except Exception:
+            return None
+        effects = getattr(result.result_data, 'effects', None) if result.is_ok() else None
+        if not effects or not effects.get('status'):
+            return None
+        return 'success' if effects['status'] == 'SUCCESS' else 'failure'
+    
+    def resolve_pending_transactions(self):
+        """Settle transactions left 'pending' or 'unknown' by an earlier run or failure
         
-        self.wallet_manager = WalletManager(self.client)
-        self.faucet_manager = FaucetManager(self.wallet_manager)
+        Digests still not on chain after TX_PENDING_MAX_AGE are marked 'dropped':
+        by then the wallet's later transactions have spent their gas coin version.
+        """
+        now = get_clock().time()
+        for digest, entry in list(self.tx_ledger.pending.items()):
+            status = self.lookup_transaction(digest)
+            if not status and now - entry.get('submitted', entry['ts']) >= Config.TX_PENDING_MAX_AGE:
+                self.tx_ledger.record(digest, entry['address'], entry['label'], 'dropped')
+                log(f"🧾 {entry['label']} {digest[:10]}... dropped: not on chain", event='tx_dropped',
+                    digest=digest)
+            elif status:
+                self.tx_ledger.record(digest, entry['address'], entry['label'], status, recovered=True)
+                log(f"🧾 {entry['label']} {digest[:10]}... resolved: {status}", event='tx_resolved',
+                    digest=digest, status=status)
+                if status == 'success':
+                    self.on_transaction(entry['address'])
+    
+    async def submit_transaction(self, txn, keypair, address: str, label: str) -> Tuple[bool, str]:
+        """Sign and execute a transaction at most once
+        
+        The digest is computed from the transaction bytes and recorded in the
+        ledger before submission. A validation rejection (see TX_REJECTION_MARKERS)
+        is final. For any other error or exception the outcome is unclear: the digest
+        is looked up on chain first; only if it is not found are the same signed
+        bytes resubmitted, which the network deduplicates by digest.
+        
+        Returns:
+            Tuple of (success, digest)
+        """
+        import base64
+        import pysui.sui.sui_pgql.pgql_query as qn
+        
+        tx_bytes = txn.build()
+        digest = txn.digest_from_bytes(base64.b64decode(tx_bytes))
+        signature = keypair.new_sign_secure(tx_bytes).value
+        self.tx_ledger.record(digest, address, label, 'pending')
+        
+        # Gas is charged whatever the outcome, so cached balances are stale
+        try:
+            error = None
+            for attempt in range(1, Config.TX_SUBMIT_RETRIES + 1):
+                try:
+                    result = self.pool.submit(address, lambda client: client.execute_query_node(
+                        with_node=qn.ExecuteTransaction(tx_bytestr=tx_bytes, sig_array=[signature])
+                    ))
+                    status = getattr(result.result_data, 'status', None) if result.is_ok() else None
+                    if status:
+                        outcome = 'success' if status == 'SUCCESS' else 'failure'
+                        self.tx_ledger.record(digest, address, label, outcome, attempt=attempt)
+                        return outcome == 'success', digest
+                    error = result.result_string
+                    if is_tx_rejection(result):
+                        # Rejected by validation (e.g. gas, locked object): definitely not executed
+                        self.tx_ledger.record(digest, address, label, 'failure', attempt=attempt, error=str(error))
+                        return False, digest
+                except Exception as e:
+                    error = str(e)
+                
+                # Ambiguous: the transaction may have landed even though the call failed
+                log(f"  ⚠️ Submit #{attempt} unclear ({error}), checking TX {digest[:10]}...",
+                    event='tx_unclear', digest=digest, attempt=attempt, error=error)
+                await delay(Config.TX_CONFIRM_DELAY, 'Confirm:')
+                outcome = self.lookup_transaction(digest)
+                if outcome:
+                    self.tx_ledger.record(digest, address, label, outcome, attempt=attempt, recovered=True)
+                    return outcome == 'success', digest
+            
+            self.tx_ledger.record(digest, address, label, 'unknown', error=error)
+            return False, digest
+        finally:
+            self.wallet_manager.invalidate(address)
     
     async def claim_xaum_faucet(self, keypair, address: str, attempt_num: int) -> bool:
         """Claim XAUM from faucet"""
+        from pysui.sui.sui_types.scalars import ObjectID, SuiString
+        from pysui.sui.sui_types.address import SuiAddress
+        from pysui.sui.sui_pgql.pgql_sync_txn import SuiTransaction
+        
         try:
-            print(f"  💰 Claim XAUM #{attempt_num}...")
+            log(f"  💰 Claim XAUM #{attempt_num}...", event='claim_start', coin='XAUM', attempt=attempt_num)
             
             # Create transaction builder for GraphQL
-            txn = SuiTransaction(client=self.client, initial_sender=SuiAddress(address))
+            client = self.pool.pinned(address)
+            txn = SuiTransaction(client=client, initial_sender=SuiAddress(address))
             
             # Build transaction with move_call
             txn.move_call(
@@ -506,34 +2193,33 @@ class CreekFinanceBot:
                 ]
             )
             
-            # Execute transaction with signer
-            result = self.client.execute_query_node(
-                with_node=self.client.execute_tx(
-                    tx_bytes=txn,
-                    signer=keypair
-                )
-            )
+            # Sign and execute once, tracked by digest
+            success, tx_digest = await self.submit_transaction(txn, keypair, address, 'claim_xaum')
             
-            if result.is_ok():
-                # Extract digest from result
-                tx_digest = getattr(result.result_data, 'digest', 'unknown')
-                print(f"  ✓ Success! TX: {str(tx_digest)[:10]}...")
+            if success:
+                log(f"  ✓ Success! TX: {tx_digest[:10]}...", event='tx_success', digest=tx_digest)
+                self.on_transaction(address)
                 await delay(get_random_delay(10, 15), 'Next:')
                 return True
             else:
-                print(f"  ✗ Failed: {result.result_string}")
+                log(f"  ✗ Failed: TX {tx_digest[:10]}...", event='tx_failed', digest=tx_digest)
                 return False
         except Exception as e:
-            print(f"  ✗ Error: {str(e)}")
+            log(f"  ✗ Error: {str(e)}", event='tx_error', error=str(e))
             return False
     
     async def claim_usdc_faucet(self, keypair, address: str, attempt_num: int) -> bool:
         """Claim USDC from faucet"""
+        from pysui.sui.sui_types.scalars import ObjectID, SuiString
+        from pysui.sui.sui_types.address import SuiAddress
+        from pysui.sui.sui_pgql.pgql_sync_txn import SuiTransaction
+        
         try:
-            print(f"  💵 Claim USDC #{attempt_num}...")
+            log(f"  💵 Claim USDC #{attempt_num}...", event='claim_start', coin='USDC', attempt=attempt_num)
             
             # Create transaction builder for GraphQL
-            txn = SuiTransaction(client=self.client, initial_sender=SuiAddress(address))
+            client = self.pool.pinned(address)
+            txn = SuiTransaction(client=client, initial_sender=SuiAddress(address))
             
             # Build transaction with move_call
             txn.move_call(
@@ -545,29 +2231,23 @@ class CreekFinanceBot:
                 ]
             )
             
-            # Execute transaction with signer
-            result = self.client.execute_query_node(
-                with_node=self.client.execute_tx(
-                    tx_bytes=txn,
-                    signer=keypair
-                )
-            )
+            # Sign and execute once, tracked by digest
+            success, tx_digest = await self.submit_transaction(txn, keypair, address, 'claim_usdc')
             
-            if result.is_ok():
-                # Extract digest from result
-                tx_digest = getattr(result.result_data, 'digest', 'unknown')
-                print(f"  ✓ Success! TX: {str(tx_digest)[:10]}...")
+            if success:
+                log(f"  ✓ Success! TX: {tx_digest[:10]}...", event='tx_success', digest=tx_digest)
+                self.on_transaction(address)
                 await delay(get_random_delay(10, 15), 'Next:')
                 return True
             else:
-                print(f"  ✗ Failed: {result.result_string}")
+                log(f"  ✗ Failed: TX {tx_digest[:10]}...", event='tx_failed', digest=tx_digest)
                 return False
         except Exception as e:
-            print(f"  ✗ Error: {str(e)}")
+            log(f"  ✗ Error: {str(e)}", event='tx_error', error=str(e))
             return False
     
     async def process_wallet(self, keypair, address: str, wallet_index: int, 
-                           total_wallets: int, proxy_url: Optional[str] = None) -> Dict:
+                           total_wallets: int, proxy_url: Optional[str] = None) -> WalletState:
         """Process all operations for a single wallet
         
         NOTE: This is a simplified version. Full implementation would include:
@@ -576,71 +2256,62 @@ class CreekFinanceBot:
         - Lending protocol (deposit, borrow, repay, withdraw)
         - Complete error handling and retry logic
         """
-        print(f"\n╔{'═' * 48}╗")
-        print(f"║  WALLET {wallet_index}/{total_wallets}")
-        print(f"╚{'═' * 48}╝")
-        print(f"Address: {address}")
-        if proxy_url:
-            print(f"Proxy: {proxy_url}")
-        else:
-            print(f"Proxy: 🌍 Local IP")
-        print()
+        with log_context(wallet=wallet_index), trace_span('wallet', 'wallet', address=address):
+            return await self._process_wallet(keypair, address, wallet_index, total_wallets, proxy_url)
+    
+    async def _process_wallet(self, keypair, address: str, wallet_index: int,
+                              total_wallets: int, proxy_url: Optional[str]) -> WalletState:
+        log_banner([
+            f"\n╔{'═' * 48}╗",
+            f"║  WALLET {wallet_index}/{total_wallets}",
+            f"╚{'═' * 48}╝",
+            f"Address: {address}",
+            f"Proxy: {proxy_url}" if proxy_url else f"Proxy: 🌍 Local IP",
+            ''
+        ], event='wallet_start', address=address)
         
-        # Get initial balance
-        balance_before = {
-            'GR': self.wallet_manager.get_token_balance(address, Config.GR_TYPE),
-            'SUI': self.wallet_manager.get_token_balance(address, Config.SUI_TYPE),
-            'USDC': self.wallet_manager.get_token_balance(address, Config.USDC_TYPE),
-            'GUSD': self.wallet_manager.get_token_balance(address, Config.GUSD_TYPE),
-            'XAUM': self.wallet_manager.get_token_balance(address, Config.XAUM_TYPE),
-        }
+        state = WalletState(wallet_index, address)
         
-        print(f"\n✅ Initial Balance Snapshot:")
-        print(f"   GR: {balance_before['GR']:.2f}, SUI: {balance_before['SUI']:.6f}, "
-              f"USDC: {balance_before['USDC']:.2f}, GUSD: {balance_before['GUSD']:.2f}")
+        # Get initial balance
+        with log_step('balance_before'):
+            balance_before = state.balance_before = BalanceSnapshot.capture(self.wallet_manager, address)
         
-        stats = {
-            'xaumClaims': 0,
-            'usdcClaims': 0,
-            'success': False
-        }
+        log(f"\n✅ Initial Balance Snapshot:\n"
+            f"   GR: {balance_before.amount('GR'):.2f}, SUI: {balance_before.amount('SUI'):.6f}, "
+            f"USDC: {balance_before.amount('USDC'):.2f}, GUSD: {balance_before.amount('GUSD'):.2f}",
+            event='balance_snapshot', balances=balance_before.to_dict())
         
         try:
             # Step 1: Ensure SUI balance
-            print('━' * 48)
-            print('📍 STEP 1: Check & Get SUI Balance')
-            print('━' * 48)
-            
-            if not await self.faucet_manager.ensure_sui_faucet(address, proxy_url):
-                print('❌ Failed to get SUI\n')
-                return {
-                    'success': False,
-                    'stats': stats,
-                    'balanceBefore': balance_before,
-                    'balanceAfter': None
-                }
+            log_banner(['━' * 48, '📍 STEP 1: Check & Get SUI Balance', '━' * 48])
+            
+            with log_step('sui_faucet'):
+                has_sui = await self.faucet_manager.ensure_sui_faucet(address, proxy_url)
+            if not has_sui:
+                log('❌ Failed to get SUI\n', event='wallet_failed', reason='sui_faucet')
+                return state
             
             # Step 2: Claim XAUM
-            print('\n━' * 48)
-            print('📍 STEP 2: Claim XAUM')
-            print('━' * 48)
+            log_banner(['\n' + '━' * 48, '📍 STEP 2: Claim XAUM', '━' * 48])
             
-            for i in range(1, Config.XAUM_CLAIM_COUNT + 1):
-                if await self.claim_xaum_faucet(keypair, address, i):
-                    stats['xaumClaims'] += 1
+            with log_step('claim_xaum'):
+                for i in range(1, Config.XAUM_CLAIM_COUNT + 1):
+                    if await self.claim_xaum_faucet(keypair, address, i):
+                        state.xaum_claims += 1
             
-            print(f"\n📊 XAUM Claims: {stats['xaumClaims']}/{Config.XAUM_CLAIM_COUNT}")
+            log(f"\n📊 XAUM Claims: {state.xaum_claims}/{Config.XAUM_CLAIM_COUNT}",
+                event='claims', token='XAUM', count=state.xaum_claims)
             
             # Step 3: Claim USDC
-            print('\n━' * 48)
-            print('📍 STEP 3: Claim USDC')
-            print('━' * 48)
+            log_banner(['\n' + '━' * 48, '📍 STEP 3: Claim USDC', '━' * 48])
             
-            for i in range(1, Config.USDC_CLAIM_COUNT + 1):
-                if await self.claim_usdc_faucet(keypair, address, i):
-                    stats['usdcClaims'] += 1
+            with log_step('claim_usdc'):
+                for i in range(1, Config.USDC_CLAIM_COUNT + 1):
+                    if await self.claim_usdc_faucet(keypair, address, i):
+                        state.usdc_claims += 1
             
-            print(f"\n📊 USDC Claims: {stats['usdcClaims']}/{Config.USDC_CLAIM_COUNT}")
+            log(f"\n📊 USDC Claims: {state.usdc_claims}/{Config.USDC_CLAIM_COUNT}",
+                event='claims', token='USDC', count=state.usdc_claims)
             
             # NOTE: Additional operations would be implemented here:
             # - Swap USDC to GUSD
@@ -653,178 +2324,611 @@ class CreekFinanceBot:
             # - Withdraw collateral
             
             # Get final balance
-            balance_after = {
-                'GR': self.wallet_manager.get_token_balance(address, Config.GR_TYPE),
-                'SUI': self.wallet_manager.get_token_balance(address, Config.SUI_TYPE),
-                'USDC': self.wallet_manager.get_token_balance(address, Config.USDC_TYPE),
-                'GUSD': self.wallet_manager.get_token_balance(address, Config.GUSD_TYPE),
-                'XAUM': self.wallet_manager.get_token_balance(address, Config.XAUM_TYPE),
-            }
-            
-            print_balance_report(address, balance_before, balance_after)
+            with log_step('balance_after'):
+                state.balance_after = BalanceSnapshot.capture(self.wallet_manager, address)
             
-            print('\n✅ Wallet processed successfully!')
-            stats['success'] = True
+            print_balance_report(address, balance_before, state.balance_after)
             
-            return {
-                'success': True,
-                'stats': stats,
-                'balanceBefore': balance_before,
-                'balanceAfter': balance_after
-            }
+            log('\n✅ Wallet processed successfully!', event='wallet_done', success=True)
+            state.success = True
+            return state
             
         except Exception as e:
-            print(f'\n❌ Error: {str(e)}')
-            
-            balance_after = {
-                'GR': self.wallet_manager.get_token_balance(address, Config.GR_TYPE),
-                'SUI': self.wallet_manager.get_token_balance(address, Config.SUI_TYPE),
-                'USDC': self.wallet_manager.get_token_balance(address, Config.USDC_TYPE),
-                'GUSD': self.wallet_manager.get_token_balance(address, Config.GUSD_TYPE),
-                'XAUM': self.wallet_manager.get_token_balance(address, Config.XAUM_TYPE),
-            }
+            log(f'\n❌ Error: {str(e)}', event='wallet_failed', error=str(e))
             
-            return {
-                'success': False,
-                'stats': stats,
-                'balanceBefore': balance_before,
-                'balanceAfter': balance_after
-            }
+            state.balance_after = BalanceSnapshot.capture(self.wallet_manager, address)
+            return state
     
-    async def run_daily_bot(self):
-        """Main bot loop - runs once every 24 hours"""
-        start_time = datetime.now()
-        day_count = 1
+    async def run_daily_bot(self, shard: Optional[Tuple[int, int]] = None,
+                            results_dir: Optional[str] = None, run_id: Optional[str] = None,
+                            schedule_file: str = Config.SCHEDULE_FILE,
+                            max_days: Optional[int] = None):
+        """Main bot loop - runs every wallet once every 24 hours
+        
+        Wallets are spread evenly over the day by WalletScheduler and each
+        one runs as it falls due, so requests arrive at a flat rate and every
+        wallet keeps a fixed 24h period.
+        
+        Args:
+            shard: Optional (index, count) to only process this shard's slice of keys
+            results_dir: Directory to write each day's total_stats to (for merging)
+            run_id: Identifier shared by all shards of the same run
+            schedule_file: File persisting the per-wallet due times
+            max_days: Stop after this many days have been reported (runs forever if None)
+        """
+        start_time = get_clock().now()
+        run_id = run_id or start_time.strftime('%Y%m%d')
+        shard_label = f" [SHARD {shard[0]}/{shard[1]}]" if shard else ''
         
         # Load proxy mappings once
         proxy_mappings = read_proxy_mappings(Config.PROXY_FILE)
         
-        print(f"\n{'═' * 70}")
-        print(f"  🤖 BOT WILL RUN ONCE EVERY DAY (24 HOUR LOOP)")
-        print(f"  🟢 Start Time: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"{'═' * 70}")
-        print(f"  📋 PROXY CONFIGURATION LOADED")
-        print(f"{'═' * 70}")
+        if shard:
+            schedule_file = shard_output_path(schedule_file, shard)
+        scheduler = WalletScheduler(schedule_file)
+        scheduler.load(get_clock().time())
+        
+        lines = [
+            f"\n{'═' * 70}",
+            f"  🤖 BOT WILL RUN EACH WALLET ONCE EVERY DAY (24 HOUR LOOP){shard_label}",
+            f"  🟢 Start Time: {start_time.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"  📅 Schedule: {schedule_file} (day #1 began "
+            f"{datetime.fromtimestamp(scheduler.anchor).strftime('%Y-%m-%d %H:%M:%S')})",
+            f"{'═' * 70}",
+            f"  📋 PROXY CONFIGURATION LOADED",
+            f"{'═' * 70}"
+        ]
         
         for key, proxy in proxy_mappings.items():
             if proxy:
-                print(f"  {key}: {proxy}")
+                lines.append(f"  {key}: {proxy}")
             else:
-                print(f"  {key}: LOCAL IP (empty line)")
-        print()
+                lines.append(f"  {key}: LOCAL IP (empty line)")
+        lines.append('')
+        log_banner(lines, event='run_start', run_id=run_id, schedule_file=schedule_file)
         
-        while True:
-            run_start_time = datetime.now()
-            print(f"\n{'═' * 70}")
-            print(f"  📅 DAY #{day_count} - {run_start_time.strftime('%Y-%m-%d')}")
-            print(f"  🟢 Start: {run_start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"{'═' * 70}\n")
-            
-            # Read private keys
-            private_keys = read_private_keys()
-            if not private_keys:
-                print('❌ No private keys found!')
-                break
-            
-            total_stats = {
-                'success': 0,
-                'failed': 0,
-                'xaumClaims': 0,
-                'usdcClaims': 0
-            }
-            
-            # Process all wallets
-            print(f"🔄 Processing {len(private_keys)} wallets...\n")
-            
-            for idx, private_key in enumerate(private_keys):
-                wallet = self.wallet_manager.import_wallet(private_key)
-                if not wallet:
-                    print(f"\n❌ Failed to import wallet #{idx + 1}\n")
-                    total_stats['failed'] += 1
+        # Settle transactions whose outcome was unknown when a previous run stopped
+        self.resolve_pending_transactions()
+        
+        wallets = None
+        day_count = None
+        days_reported = 0
+        run_start_time = run_end_time = None
+        total_stats = {}
+        
+        monitor_task = None
+        if self.health_monitor:
+            monitor_task = asyncio.ensure_future(self.health_monitor.run())
+        
+        try:
+            while True:
+                # Reload private keys (only re-derives keys that changed)
+                if self.wallet_registry.reload() or wallets is None:
+                    private_keys = self.wallet_registry.private_keys
+                    if not private_keys:
+                        log('❌ No private keys found!', event='error')
+                        break
+                    
+                    wallets = {}
+                    invalid_count = 0
+                    for wallet_index, private_key in self.wallet_registry.shard_keys:
+                        wallet = self.wallet_registry.get_wallet(private_key)
+                        if wallet:
+                            wallets[wallet[1]] = (wallet_index, wallet[0])
+                        else:
+                            invalid_count += 1
+                    scheduler.sync([(address, (wallet_index - 1) / len(private_keys))
+                                    for address, (wallet_index, _) in wallets.items()], get_clock().time())
+                    if self.health_monitor:
+                        self.health_monitor.track(wallets)
+                
+                head = scheduler.peek()
+                if head is None and not results_dir:
+                    log('❌ No valid wallets to schedule!', event='error')
+                    break
+                
+                if head is None:
+                    # Shard without valid wallets: still report (empty) days so merges don't wait on it
+                    now = get_clock().time()
+                    if day_count is None:
+                        day_count = scheduler.day_of(now)
+                        run_start_time = run_end_time = None
+                        total_stats = {
+                            'success': 0,
+                            'failed': invalid_count,
+                            'xaumClaims': 0,
+                            'usdcClaims': 0
+                        }
+                    day_end = scheduler.anchor + day_count * scheduler.period
+                    if now < day_end:
+                        await delay(int(day_end - now) + 1, 'No valid wallets in this shard, day ends in')
+                        continue
+                    self._finish_day(day_count, run_start_time, run_end_time, total_stats,
+                                     shard, shard_label, results_dir, run_id)
+                    days_reported += 1
+                    if max_days is not None and days_reported >= max_days:
+                        break
+                    day_count = None
                     continue
+                due, address = head
                 
-                keypair, address = wallet
+                # Close out the previous day once the next wallet belongs to a later one
+                due_day = scheduler.day_of(due)
+                if day_count is not None and due_day > day_count:
+                    self._finish_day(day_count, run_start_time, run_end_time, total_stats,
+                                     shard, shard_label, results_dir, run_id)
+                    days_reported += 1
+                    if max_days is not None and days_reported >= max_days:
+                        break
+                    day_count = None
+                
+                if day_count is None:
+                    day_count = due_day
+                    run_start_time = run_end_time = None
+                    total_stats = {
+                        'success': 0,
+                        'failed': invalid_count,
+                        'xaumClaims': 0,
+                        'usdcClaims': 0
+                    }
+                    if invalid_count:
+                        log(f"\n❌ {invalid_count} wallets failed to import\n",
+                            event='invalid_keys', count=invalid_count)
+                    day_start = datetime.fromtimestamp(scheduler.anchor + (day_count - 1) * scheduler.period)
+                    log_banner([
+                        f"\n{'═' * 70}",
+                        f"  📅 DAY #{day_count} - {day_start.strftime('%Y-%m-%d')}{shard_label}",
+                        f"  🟢 Window start: {day_start.strftime('%Y-%m-%d %H:%M:%S')}",
+                        f"  🔄 {len(wallets)} wallets spread over 24 hours",
+                        f"{'═' * 70}\n"
+                    ], event='day_start', day=day_count, wallets=len(wallets))
+                
+                # Wait until the wallet is due
+                wait_time = due - get_clock().time()
+                if wait_time > 0:
+                    scheduler.maybe_save()
+                    await delay(int(wait_time) + 1, f'Next wallet due at {datetime.fromtimestamp(due).strftime("%Y-%m-%d %H:%M:%S")}:')
+                    continue
+                
+                wallet_index, keypair = wallets[address]
+                if run_start_time is None:
+                    run_start_time = get_clock().now()
                 
                 # Get proxy for this wallet
-                proxy_url = get_proxy_for_wallet(idx + 1, proxy_mappings)
+                proxy_url = get_proxy_for_wallet(wallet_index, proxy_mappings)
                 
                 # Process wallet
                 result = await self.process_wallet(
-                    keypair, address, idx + 1, len(private_keys), proxy_url
+                    keypair, address, wallet_index, len(private_keys), proxy_url
                 )
                 
-                if result['success']:
-                    total_stats['success'] += 1
-                else:
-                    total_stats['failed'] += 1
-                
                 # Update stats
-                for key in result['stats']:
-                    if key in total_stats:
-                        total_stats[key] += result['stats'][key]
+                result.add_to(total_stats)
                 
-                # Delay before next wallet
-                if idx < len(private_keys) - 1:
-                    await delay(get_random_delay(30, 60), 'Next wallet:')
-            
-            run_end_time = datetime.now()
-            process_duration = int((run_end_time - run_start_time).total_seconds() / 60)
-            
-            # Print statistics
-            print(f"\n{'═' * 70}")
-            print(f"  ✅ DAY #{day_count} COMPLETED!")
-            print(f"{'═' * 70}")
-            print(f"  🟢 Start: {run_start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"  🔴 End: {run_end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"  ⏱️ Duration: {process_duration} minutes")
-            print(f"{'─' * 70}")
-            print('  📊 STATISTICS:')
-            print(f"    🎯 Total: {len(private_keys)} | ✓ {total_stats['success']} | ✗ {total_stats['failed']}")
-            print(f"    💰 XAUM: {total_stats['xaumClaims']}/{len(private_keys) * Config.XAUM_CLAIM_COUNT} | "
-                  f"💵 USDC: {total_stats['usdcClaims']}/{len(private_keys) * Config.USDC_CLAIM_COUNT}")
-            print(f"{'═' * 70}\n")
-            
-            # Calculate wait time until next day
-            next_run_time = run_start_time + timedelta(days=1)
-            wait_time = (next_run_time - datetime.now()).total_seconds()
-            wait_hours = int(wait_time / 3600)
-            wait_minutes = int((wait_time % 3600) / 60)
-            
-            print(f"\n{'═' * 70}")
-            print(f"  ⏰ WAITING 24 HOURS UNTIL TOMORROW...")
-            print(f"{'═' * 70}")
-            print(f"  📅 Today: {run_start_time.strftime('%Y-%m-%d')}")
-            print(f"  🔄 Next run: {next_run_time.strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"  ⏱️ Wait: {wait_hours} hours {wait_minutes} minutes")
-            print(f"  💤 Bot will automatically run again tomorrow")
-            print(f"{'═' * 70}\n")
-            
-            # Wait until next day
-            await delay(int(wait_time), f'Waiting until {next_run_time.strftime("%Y-%m-%d %H:%M:%S")}')
-            
-            day_count += 1
-            print('\n' + '═' * 50)
+                run_end_time = get_clock().now()
+                scheduler.complete(address, get_clock().time())
+        finally:
+            if monitor_task:
+                monitor_task.cancel()
+            scheduler.save()
+    
+    def _finish_day(self, day_count: int, run_start_time: Optional[datetime],
+                    run_end_time: Optional[datetime], total_stats: Dict,
+                    shard: Optional[Tuple[int, int]], shard_label: str,
+                    results_dir: Optional[str], run_id: str):
+        """Print a finished day's statistics and write its shard results
+        
+        A shard that processed no wallets writes null start/end times, so it
+        does not stretch the merged day's duration.
+        """
+        wallet_count = total_stats['success'] + total_stats['failed']
+        
+        shown_start = run_start_time or get_clock().now()
+        print_day_statistics(day_count, shown_start, run_end_time or shown_start,
+                             wallet_count, total_stats, shard_label)
+        self.resolve_pending_transactions()
+        self.tx_ledger.compact()
+        
+        if self.health_monitor:
+            lowest = self.health_monitor.lowest(3)
+            if lowest:
+                lines = ['  🩺 Lowest health factors:']
+                for health_factor, address in lowest:
+                    value = '∞' if health_factor == float('inf') else f'{health_factor:.2f}'
+                    lines.append(f"    {address[:12]}...{address[-8:]}: {value} {health_factor_status(health_factor)}")
+                lines.append('')
+                log_event('health_lowest', '\n'.join(lines), day=day_count,
+                          lowest=[[address, value] for value, address in lowest])
+        
+        if results_dir:
+            result_path = shard_result_path(results_dir, run_id, day_count, shard or (1, 1))
+            write_shard_result(result_path, {
+                'runId': run_id,
+                'day': day_count,
+                'shard': list(shard or (1, 1)),
+                'wallets': wallet_count,
+                'start': run_start_time.isoformat() if run_start_time else None,
+                'end': (run_end_time or run_start_time).isoformat() if run_start_time else None,
+                'stats': total_stats
+            })
+            log(f"  💾 Results written to {result_path}\n", event='results_written', path=str(result_path))
+
+
+# ============================================
+# SIMULATION
+# ============================================
+
+class SimulatedClientPool:
+    """Local stand-in for ClientPool; the simulation never talks to a node"""
+    
+    def __init__(self):
+        self.endpoints: List[PoolEndpoint] = []
+    
+    def read(self, fn):
+        raise RuntimeError("No GraphQL endpoint in simulation")
+    
+    def submit(self, address: str, fn):
+        raise RuntimeError("No GraphQL endpoint in simulation")
+    
+    def pinned(self, address: str):
+        raise RuntimeError("No GraphQL endpoint in simulation")
+
+
+class SimulatedWalletManager:
+    """Local stand-in for WalletManager that derives fake addresses without pysui"""
+    
+    def import_wallet(self, private_key: str) -> Tuple[None, str]:
+        return (None, '0x' + hashlib.sha256(private_key.encode()).hexdigest())
+    
+    def invalidate(self, address: str):
+        pass
+
+
+class SimulatedFaucetManager:
+    """Local stand-in for FaucetManager; every wallet already has gas"""
+    
+    async def ensure_sui_faucet(self, address: str, proxy: Optional[str] = None) -> bool:
+        return True
+
+
+class SimulatedBot(CreekFinanceBot):
+    """CreekFinanceBot with the chain replaced by a local stand-in
+    
+    Each wallet takes a random (virtual) amount of time to process, and
+    every processing start is recorded for the throughput/fairness report.
+    """
+    
+    def __init__(self, key_file: str, wallet_seconds: Tuple[int, int] = (60, 180)):
+        super().__init__(pool=SimulatedClientPool(), wallet_manager=SimulatedWalletManager(),
+                         faucet_manager=SimulatedFaucetManager(), key_file=key_file,
+                         ledger_file=os.devnull, monitor_health=False)
+        self.wallet_seconds = wallet_seconds
+        self.runs: Dict[str, List[float]] = {}
+        self.busy_seconds = 0.0
+    
+    async def process_wallet(self, keypair, address: str, wallet_index: int,
+                             total_wallets: int, proxy_url: Optional[str] = None) -> WalletState:
+        self.runs.setdefault(address, []).append(get_clock().time())
+        duration = get_random_delay(*self.wallet_seconds)
+        self.busy_seconds += duration
+        await get_clock().sleep(duration)
+        
+        state = WalletState(wallet_index, address)
+        state.success = True
+        state.xaum_claims = Config.XAUM_CLAIM_COUNT
+        state.usdc_claims = Config.USDC_CLAIM_COUNT
+        return state
+
+
+async def simulate_schedule(wallet_count: int, days: int,
+                            wallet_seconds: Tuple[int, int] = (60, 180)) -> Dict:
+    """Replay a multi-day scheduled run on a virtual clock
+    
+    Returns:
+        Dict with hourly throughput and per-wallet period statistics
+    """
+    import tempfile
+    
+    clock = VirtualClock()
+    previous_clock = set_clock(clock)
+    sim_log = EventLog(console=False)
+    previous_log = set_event_log(sim_log)
+    started = time.monotonic()
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            key_file = os.path.join(tmp_dir, 'keys.txt')
+            with open(key_file, 'w') as f:
+                f.write('\n'.join(f'simkey{index}' for index in range(wallet_count)))
+            
+            bot = SimulatedBot(key_file, wallet_seconds)
+            sim_start = clock.time()
+            await bot.run_daily_bot(schedule_file=os.path.join(tmp_dir, 'schedule.json'),
+                                    max_days=days)
+    finally:
+        set_clock(previous_clock)
+        set_event_log(previous_log)
+        sim_log.close()
+    
+    hourly = [0] * (days * 24)
+    periods = []
+    for starts in bot.runs.values():
+        for run_time in starts:
+            hour = int((run_time - sim_start) // 3600)
+            if hour < len(hourly):
+                hourly[hour] += 1
+        periods.extend(later - earlier for earlier, later in zip(starts, starts[1:]))
+    
+    return {
+        'wallets': wallet_count,
+        'days': days,
+        'runs': sum(len(starts) for starts in bot.runs.values()),
+        'hourly_min': min(hourly),
+        'hourly_max': max(hourly),
+        'hourly_mean': sum(hourly) / len(hourly),
+        'period_min': min(periods) if periods else 0.0,
+        'period_max': max(periods) if periods else 0.0,
+        'utilization': bot.busy_seconds / max(clock.time() - sim_start, 1.0),
+        'virtual_seconds': clock.time() - sim_start,
+        'wall_seconds': time.monotonic() - started
+    }
+
+
+def print_simulation_report(report: Dict):
+    """Print the result of simulate_schedule"""
+    lines = [
+        f"\n{'═' * 70}",
+        f"  🧪 SCHEDULE SIMULATION: {report['wallets']} wallets × {report['days']} days",
+        f"{'═' * 70}",
+        f"  ⏱️ Simulated {report['virtual_seconds'] / 3600:.1f}h in {report['wall_seconds']:.2f}s",
+        f"  🔄 Wallet runs: {report['runs']} | Busy: {report['utilization'] * 100:.0f}%",
+        f"  📈 Runs per hour: min {report['hourly_min']} | max {report['hourly_max']} | "
+        f"mean {report['hourly_mean']:.1f}",
+        f"  ⚖️ Period per wallet: min {report['period_min'] / 3600:.2f}h | "
+        f"max {report['period_max'] / 3600:.2f}h"
+    ]
+    if report['period_max'] > Config.SCHEDULE_PERIOD * 1.01:
+        lines.append(f"  ⚠️ Wallets take longer than their slot - add workers or shards")
+    lines.append(f"{'═' * 70}\n")
+    log_event('simulation_report', '\n'.join(lines), **report)
+
+
+# ============================================
+# SHARDED EXECUTION
+# ============================================
+
+def run_shard_worker(shard: Tuple[int, int], results_dir: str, run_id: str,
+                     preflight: bool = True, event_log: Optional[str] = None, quiet: bool = False,
+                     trace: Optional[str] = None):
+    """Entry point of a worker process running one shard of the key list"""
+    set_event_log(EventLog(path=shard_output_path(event_log, shard), quiet=quiet))
+    if trace:
+        set_tracer(Tracer(shard_output_path(trace, shard)))
+    bot = CreekFinanceBot(shard)
+    if preflight and not bot.preflight():
+        raise SystemExit(1)
+    try:
+        asyncio.run(bot.run_daily_bot(shard=shard, results_dir=results_dir, run_id=run_id))
+    except KeyboardInterrupt:
+        pass
+
+
+def report_merged_day(results_dir: str, run_id: str, day: int, shard_count: int) -> bool:
+    """Merge and print one day's report once every shard has written its results
+    
+    Returns:
+        True if all shard files were present and the report was printed
+    """
+    paths = [shard_result_path(results_dir, run_id, day, (index, shard_count))
+             for index in range(1, shard_count + 1)]
+    if not all(path.exists() for path in paths):
+        return False
+    
+    results = []
+    for path in paths:
+        with open(path, 'r') as f:
+            results.append(json.load(f))
+    
+    merged = merge_shard_results(results)
+    start = datetime.fromisoformat(merged['start']) if merged['start'] else get_clock().now()
+    end = datetime.fromisoformat(merged['end']) if merged['end'] else start
+    print_day_statistics(day, start, end, merged['wallets'],
+                         merged['stats'], f" [MERGED {shard_count} SHARDS]")
+    return True
+
+
+def merge_results_dir(results_dir: str, run_id: str, shard_count: int) -> int:
+    """Print merged reports for every complete day found in a results directory
+    
+    Used as the coordinator for multi-host runs where each host writes its
+    shard's results to a shared directory.
+    
+    Returns:
+        Number of days reported
+    """
+    reported = [day for day in result_days(results_dir, run_id, shard_count)
+                if report_merged_day(results_dir, run_id, day, shard_count)]
+    
+    if not reported:
+        log(f"⚠️ No complete day found in {results_dir} for run {run_id} ({shard_count} shards)", event='warning')
+    return len(reported)
+
+
+async def run_sharded(worker_count: int, results_dir: str, run_id: str, preflight: bool = True,
+                      event_log: Optional[str] = None, quiet: bool = False,
+                      trace: Optional[str] = None) -> bool:
+    """Start one worker process per shard and merge their daily results
+    
+    A merged day needs every shard's results, so if a worker dies (failed
+    preflight, crash) the run is stopped instead of waiting for reports
+    that can never complete.
+    
+    Returns:
+        True if every worker exited cleanly
+    """
+    log(f"🧩 Starting {worker_count} worker processes (run {run_id})\n", event='workers_start',
+        workers=worker_count, run_id=run_id)
+    
+    # Spawn (not fork) so workers don't inherit the running event loop
+    context = multiprocessing.get_context('spawn')
+    workers = []
+    for index in range(1, worker_count + 1):
+        process = context.Process(
+            target=run_shard_worker,
+            args=((index, worker_count), results_dir, run_id, preflight, event_log, quiet, trace),
+            name=f'creek-shard-{index}'
+        )
+        process.start()
+        workers.append(process)
+    
+    reported = set()
+    
+    def report_new_days():
+        for day in result_days(results_dir, run_id, worker_count):
+            if day not in reported and report_merged_day(results_dir, run_id, day, worker_count):
+                reported.add(day)
+    
+    failed = []
+    try:
+        while any(process.is_alive() for process in workers):
+            report_new_days()
+            failed = [(index, process.exitcode) for index, process in enumerate(workers, 1)
+                      if process.exitcode]
+            if failed:
+                break
+            await get_clock().sleep(Config.SHARD_POLL_INTERVAL)
+        
+        # Pick up a report written just before the workers exited
+        report_new_days()
+        failed = failed or [(index, process.exitcode) for index, process in enumerate(workers, 1)
+                            if process.exitcode]
+        if failed:
+            details = ', '.join(f"shard {index}/{worker_count} (exit code {code})" for index, code in failed)
+            log(f"❌ Worker failed: {details} - stopping the run ({len(reported)} days reported)",
+                event='worker_failed', shards=[index for index, _ in failed],
+                exit_codes=[code for _, code in failed], reported_days=sorted(reported))
+        return not failed
+    finally:
+        for process in workers:
+            if process.is_alive():
+                process.terminate()
+            process.join()
 
 
 # ============================================
 # MAIN ENTRY POINT
 # ============================================
 
-async def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Creek Finance automation bot (SUI Testnet)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of local worker processes, each running one shard of the keys')
+    parser.add_argument('--shard', type=parse_shard_spec, default=None, metavar='i/N',
+                        help='Only run shard i of N (1-based), for multi-host runs')
+    parser.add_argument('--results-dir', default=None,
+                        help=f'Directory for per-shard daily results (default: {Config.RESULTS_DIR} when sharded)')
+    parser.add_argument('--run-id', default=None,
+                        help='Identifier shared by all shards of a run (default: start date)')
+    parser.add_argument('--merge', type=int, default=None, metavar='N',
+                        help='Merge results of N shards from --results-dir into daily reports and exit')
+    parser.add_argument('--preflight', action='store_true',
+                        help='Only run the preflight checks and exit')
+    parser.add_argument('--skip-preflight', action='store_true',
+                        help='Start the wallet loop without running the preflight checks')
+    parser.add_argument('--balances', action='store_true',
+                        help='Print the balances of every wallet and exit')
+    parser.add_argument('--simulate', type=int, default=None, metavar='WALLETS',
+                        help='Simulate the scheduler on a virtual clock with this many wallets and exit')
+    parser.add_argument('--simulate-days', type=int, default=3, metavar='DAYS',
+                        help='Number of days to simulate (default: 3)')
+    parser.add_argument('--simulate-wallet-seconds', type=int, nargs=2, default=[60, 180],
+                        metavar=('MIN', 'MAX'),
+                        help='Simulated processing time per wallet in seconds (default: 60 180)')
+    parser.add_argument('--event-log', default=None, metavar='PATH',
+                        help='Append every event as a JSON line to this file (one file per shard)')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Drop banners from the console output')
+    parser.add_argument('--trace', default=None, metavar='PATH',
+                        help='Write spans of wallet steps, GraphQL calls and faucet requests to this '
+                             'Chrome trace file and print a timing summary on exit (one file per shard)')
+    args = parser.parse_args(argv)
+    
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.workers > 1 and args.shard:
+        parser.error('--workers and --shard cannot be combined')
+    if args.preflight and args.skip_preflight:
+        parser.error('--preflight and --skip-preflight cannot be combined')
+    
+    sharded = args.workers > 1 or args.shard or args.merge
+    if sharded and not args.results_dir:
+        args.results_dir = Config.RESULTS_DIR
+    if not args.run_id:
+        args.run_id = get_clock().now().strftime('%Y%m%d')
+    return args
+
+
+async def main(argv: Optional[List[str]] = None):
     """Main entry point"""
-    print('\n🤖 AUTO BOT CREEK FINANCE - SUI TESTNET (Python Version)')
-    print('📝 Rewritten in Python using pysui 0.92+ (GraphQL API)')
-    print('🔄 Updated: Migrated from JSON RPC to GraphQL client')
-    print('⚠️ SECURITY: This is a simplified implementation for educational purposes\n')
+    args = parse_args(argv)
+    
+    set_event_log(EventLog(path=args.event_log, quiet=args.quiet))
+    
+    log_banner([
+        '\n🤖 AUTO BOT CREEK FINANCE - SUI TESTNET (Python Version)',
+        '📝 Rewritten in Python using pysui 0.92+ (GraphQL API)',
+        '🔄 Updated: Migrated from JSON RPC to GraphQL client',
+        '⚠️ SECURITY: This is a simplified implementation for educational purposes\n'
+    ], event='startup')
+    
+    if args.merge:
+        merge_results_dir(args.results_dir, args.run_id, args.merge)
+        return
+    
+    if args.simulate:
+        print_simulation_report(await simulate_schedule(
+            args.simulate, args.simulate_days, tuple(args.simulate_wallet_seconds)
+        ))
+        return
+    
+    # Cheap key check before any heavy import or client setup
+    if not read_private_keys():
+        log('❌ No private keys found!', event='error')
+        raise SystemExit(1)
+    
+    if args.workers > 1 and not (args.preflight or args.balances):
+        try:
+            ok = await run_sharded(args.workers, args.results_dir, args.run_id,
+                                   preflight=not args.skip_preflight,
+                                   event_log=args.event_log, quiet=args.quiet, trace=args.trace)
+        except KeyboardInterrupt:
+            log('\n\n⏹️ Bot stopped by user', event='stopped')
+            return
+        if not ok:
+            raise SystemExit(1)
+        return
+    
+    if args.trace:
+        set_tracer(Tracer(args.trace))
+    
+    bot = CreekFinanceBot(args.shard)
+    
+    if args.balances:
+        bot.print_wallet_balances()
+        return
     
-    bot = CreekFinanceBot()
+    if not args.skip_preflight:
+        if not bot.preflight():
+            raise SystemExit(1)
+        if args.preflight:
+            return
     
     try:
-        await bot.run_daily_bot()
+        await bot.run_daily_bot(shard=args.shard, results_dir=args.results_dir, run_id=args.run_id)
     except KeyboardInterrupt:
-        print('\n\n⏹️ Bot stopped by user')
+        log('\n\n⏹️ Bot stopped by user', event='stopped')
     except Exception as e:
-        print(f'\n\n❌ Fatal Error: {str(e)}')
+        log(f'\n\n❌ Fatal Error: {str(e)}', event='fatal', error=str(e))
         raise
 
 